@@ -1,25 +1,23 @@
 """Main script, uses other modules to generate sentences."""
 from flask import Flask
 from markov_chain import MarkovChain
-from text_cleaner import clean_corpus
+from model_cache import load_or_build
 
 app = Flask(__name__)
 
 
-# Try to load the corpus, or use a backup text if it fails
+# Try to load the Markov chain trained on the corpus, or use a backup text if it fails.
+# The trained chain is cached on disk, so only the first startup (or the first after
+# the corpus changes) has to clean the corpus and train
 try:
     corpus_path = 'data/dracula.txt'
-    word_list = clean_corpus(corpus_path)
-    print(f"Loaded {len(word_list)} words from {corpus_path}")
+    markov_chain = load_or_build(corpus_path)
+    print(f"Loaded {len(markov_chain.vocab)} distinct words from {corpus_path}")
 except Exception as e:
     print(f"Error loading corpus: {e}")
     # Use a backup text if the corpus loading fails
     fish_text = 'one fish two fish red fish blue fish'
-    word_list = fish_text.split()
-
-
-# initialize the Markov chain
-markov_chain = MarkovChain(word_list)
+    markov_chain = MarkovChain(fish_text.split())
 
 @app.route("/")
 def home():
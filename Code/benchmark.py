@@ -0,0 +1,695 @@
+#!python
+"""Benchmarks for the tweet generator data structures.
+
+Run all benchmarks with `python benchmark.py`, or only some of them by name,
+for example `python benchmark.py sample`."""
+
+from __future__ import division, print_function  # Python 2 and 3 compatibility
+from bisect import bisect_left
+import gc
+import random
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from concurrent_hashtable import ConcurrentHashTable
+from dictogram import Dictogram
+from hashtable import HashTable
+from frozen_histogram import FrozenHistogram
+import histogram
+from linkedlist import LinkedList, Node
+from listogram import FrequencyListogram, Listogram, SortedListogram
+from markov_chain import MarkovChain
+from open_hashtable import OpenHashTable
+from parallel_trainer import train_parallel
+import model_cache
+import text_cleaner
+from text_cleaner import clean_corpus, iter_clean_words
+
+CORPUS_PATH = 'data/dracula.txt'
+
+
+def time_it(function, repeat=3):
+    """Call function repeat times and return the fastest time in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def linear_sample(histogram):
+    """Sample a Dictogram the old way, walking every entry in .items()."""
+    random_value = random.randint(1, histogram.tokens)
+    cumulative = 0
+    for word, count in histogram.items():
+        cumulative += count
+        if random_value <= cumulative:
+            return word
+
+
+def benchmark_sample(draws=100000):
+    """Compare draws/sec of Dictogram.sample against a linear scan on the
+    followers of a few words in the Dracula Markov chain."""
+    print('Dictogram.sample: binary search vs linear scan ({} draws)'.format(draws))
+    chain = MarkovChain(clean_corpus(CORPUS_PATH))
+    print('| word    | types | linear draws/s | indexed draws/s | speedup |')
+    for word in ['the', 'and', 'I', 'Dracula']:
+        followers = chain.markov_dict[chain.vocab.encode([word])]
+        followers.sample()  # Build the sampling index outside the timing
+        linear = time_it(lambda: [linear_sample(followers) for _ in range(draws)])
+        indexed = time_it(lambda: [followers.sample() for _ in range(draws)])
+        print('| {:<7} | {:>5} | {:>14,.0f} | {:>15,.0f} | {:>6.1f}x |'.format(
+            word, followers.types, draws / linear, draws / indexed, linear / indexed))
+    print()
+
+
+def benchmark_sample_many(draws=10000):
+    """Compare one sample_many(k) call against k calls to sample() on the
+    whole Dracula word distribution, like print_histogram_samples does."""
+    print('sample_many(k) vs k calls to sample() ({} draws)'.format(draws))
+    words = clean_corpus(CORPUS_PATH)
+    print('| histogram | types | sample() loop | sample_many(k) | speedup |')
+    # Listogram is quadratic to build, so give it a smaller vocabulary
+    for histogram in [Dictogram(words), Listogram(words[:20000])]:
+        loop = time_it(lambda: [histogram.sample() for _ in range(draws)])
+        batch = time_it(lambda: histogram.sample_many(draws))
+        print('| {:<9} | {:>5} | {:>12.1f}ms | {:>13.1f}ms | {:>6.1f}x |'.format(
+            type(histogram).__name__, histogram.types,
+            loop * 1000, batch * 1000, loop / batch))
+    print()
+
+
+def benchmark_order(sentences=10000):
+    """Report build time, memory and sentence generation speed of Markov
+    chains of order 1 to 3 on the Dracula corpus."""
+    print('MarkovChain build time and memory per order')
+    words = clean_corpus(CORPUS_PATH)
+    print('| order | states  | build time | memory   | sentences/s |')
+    for order in (1, 2, 3):
+        build = time_it(lambda: MarkovChain(words, order=order), repeat=1)
+        # Measure memory held by the chain, not temporary allocations
+        tracemalloc.start()
+        chain = MarkovChain(words, order=order)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        generate = time_it(lambda: [chain.generate_sentence(15)
+                                    for _ in range(sentences)])
+        print('| {:>5} | {:>7,} | {:>8.2f}s | {:>5.1f} MB | {:>11,.0f} |'.format(
+            order, len(chain.states), build, memory / 1e6, sentences / generate))
+        del chain
+    print()
+
+
+def benchmark_compile(sentences=10000):
+    """Compare memory and sentence generation speed of Markov chains backed
+    by Dictograms against chains compiled into a TransitionTable."""
+    print('MarkovChain Dictograms vs compiled TransitionTable')
+    words = clean_corpus(CORPUS_PATH)
+    print('| order | chain    | memory   | sentences/s |')
+    for order in (1, 2):
+        # Memory held by the chain before and after compiling it
+        tracemalloc.start()
+        chain = MarkovChain(words, order=order)
+        dict_memory = tracemalloc.get_traced_memory()[0]
+        chain.compile()
+        compiled_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        # Time generation without tracing, which slows down allocations
+        for name, memory, chain in [
+                ('dict', dict_memory, MarkovChain(words, order=order)),
+                ('compiled', compiled_memory, chain)]:
+            generate = time_it(lambda: [chain.generate_sentence(15)
+                                        for _ in range(sentences)])
+            print('| {:>5} | {:<8} | {:>5.1f} MB | {:>11,.0f} |'.format(
+                order, name, memory / 1e6, sentences / generate))
+        del chain
+    print()
+
+
+def peak_memory(function):
+    """Call function and return the peak memory it allocated in bytes."""
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def benchmark_stream():
+    """Compare peak memory of counting the Dracula corpus from a list of all
+    its cleaned words against streaming them from iter_clean_words."""
+    print('Peak memory of a Dictogram of {}'.format(CORPUS_PATH))
+    print('| source           | peak memory |')
+    for name, source in [('clean_corpus', lambda: clean_corpus(CORPUS_PATH)),
+                         ('iter_clean_words', lambda: iter_clean_words(CORPUS_PATH))]:
+        peak = peak_memory(lambda: Dictogram(source()))
+        print('| {:<16} | {:>8.1f} MB |'.format(name, peak / 1e6))
+    print()
+
+
+def legacy_histogram(path):
+    """Count a .txt file the old way, reading and splitting the whole file."""
+    with open(path, 'r') as file:
+        words = file.read().lower().split()
+    return sorted(Dictogram.from_iterable(words).items())
+
+
+def benchmark_histogram_stream(copies=5):
+    """Compare peak memory and time of histogram.histogram reading the whole
+    file against streaming it in chunks, and of top_k, on the Dracula corpus
+    and on a file of copies of it."""
+    print('histogram.histogram: whole file vs chunks')
+    temp_dir = tempfile.mkdtemp()
+    try:
+        big_path = os.path.join(temp_dir, 'dracula_x{}.txt'.format(copies))
+        with open(CORPUS_PATH, 'r') as source, open(big_path, 'w') as target:
+            text = source.read()
+            for _ in range(copies):
+                target.write(text)
+        print('| file           | size    | method     | peak memory | time    |')
+        for path in (CORPUS_PATH, big_path):
+            size = os.path.getsize(path)
+            for name, function in [('whole file', legacy_histogram),
+                                   ('chunks', histogram.histogram),
+                                   ('top_k(10)', lambda path: histogram.top_k(10, path))]:
+                peak = peak_memory(lambda: function(path))
+                print('| {:<14} | {:>4.1f} MB | {:<10} | {:>8.1f} MB | {:>5.2f} s |'.format(
+                    os.path.basename(path), size / 1e6, name, peak / 1e6,
+                    time_it(lambda: function(path), repeat=1)))
+    finally:
+        shutil.rmtree(temp_dir)
+    print()
+
+
+def retained_memory(function):
+    """Call function and return the memory still held by its result in bytes."""
+    tracemalloc.start()
+    result = function()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def benchmark_frozen_histogram(lookups=100000, draws=100000):
+    """Compare the memory held by histogram.histogram's list of (word, count)
+    tuples, a Dictogram and a FrozenHistogram of the Dracula corpus, and their
+    lookup and sampling speed. All three share the counted word strings, so
+    only the memory of each histogram's own structure is measured."""
+    counts = histogram.count_words(CORPUS_PATH)
+    pairs = sorted(counts.items())
+    words = [random.choice(pairs)[0] for _ in range(lookups)]
+    print('FrozenHistogram vs histogram.histogram ({:,} types, {:,} tokens)'.format(
+        len(pairs), sum(counts.values())))
+    print('| histogram       | memory  | bytes/type | lookups/s  | draws/s    |')
+    for name, make in [('list of tuples', lambda: sorted(counts.items())),
+                       ('Dictogram', lambda: Dictogram(counts)),
+                       ('FrozenHistogram', lambda: FrozenHistogram(counts))]:
+        # build one first, so freed temporary tuples already fill the
+        # interpreter's free lists and don't count as memory held
+        table = make()
+        memory = retained_memory(make)
+        if name == 'list of tuples':
+            # the sorted list can only be binary searched, and has no sampling
+            lookup = time_it(lambda: [table[bisect_left(table, (word,))][1]
+                                      for word in words])
+            draws_per_second = '-'
+        else:
+            lookup = time_it(lambda: [table.frequency(word) for word in words])
+            sample = time_it(lambda: table.sample_many(draws), repeat=1)
+            draws_per_second = '{:,.0f}'.format(draws / sample)
+        print('| {:<15} | {:>4.2f} MB | {:>10,.1f} | {:>10,.0f} | {:>10} |'.format(
+            name, memory / 1e6, memory / len(pairs), lookups / lookup, draws_per_second))
+    print()
+
+
+def legacy_process_text(text):
+    """Clean text the old way, with one full-text re.sub pass per rule."""
+    text = text.replace('\n', ' ')
+    text = re.sub(r'[_\*\[\]\{\}]', ' ', text)
+    text = re.sub(r'\d+', ' ', text)
+    text = re.sub(r'([A-Z])(\d)', r'\1 \2', text)
+    text = re.sub(r'([a-z])(\d)', r'\1 \2', text)
+    text = text.replace('"', ' ')
+    text = re.sub(r'(\w)\'(\w)', r'\1\'\2', text)
+    text = re.sub(r'(?<!\w)\'|\'(?!\w)', ' ', text)
+    text = re.sub(r'[,:;()[\]{}]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return [word for word in text.split() if word and not all(c in '._-–—' for c in word)]
+
+
+def benchmark_cleaner():
+    """Check the single-pass cleaner gives the same words as the old chain
+    of re.sub passes on the bundled corpora, and compare their speed."""
+    print('text_cleaner._process_text: single pass vs chained re.sub')
+    print('| corpus           | words   | identical | chained  | single   | speedup |')
+    for path in [CORPUS_PATH, 'data/sample.txt']:
+        with open(path, 'r', encoding='utf-8') as file:
+            text = file.read()
+        words = text_cleaner._process_text(text)
+        identical = words == legacy_process_text(text)
+        legacy = time_it(lambda: legacy_process_text(text))
+        single = time_it(lambda: text_cleaner._process_text(text))
+        print('| {:<16} | {:>7,} | {!s:<9} | {:>6.1f}ms | {:>6.1f}ms | {:>6.1f}x |'.format(
+            path, len(words), identical, legacy * 1000, single * 1000, legacy / single))
+    print()
+
+
+def benchmark_cache():
+    """Compare app.py's startup cost of cleaning and training on the Dracula
+    corpus against loading the model saved by model_cache."""
+    print('Markov chain startup: train from corpus vs load cached model')
+    cache_dir = tempfile.mkdtemp()
+    try:
+        train = time_it(lambda: MarkovChain(clean_corpus(CORPUS_PATH)), repeat=1)
+        model_cache.load_or_build(CORPUS_PATH, cache_dir=cache_dir)
+        load = time_it(lambda: model_cache.load_or_build(CORPUS_PATH, cache_dir=cache_dir))
+        size = os.path.getsize(model_cache.model_path(CORPUS_PATH, cache_dir=cache_dir))
+    finally:
+        shutil.rmtree(cache_dir)
+    print('| train    | load cached | speedup | model file |')
+    print('| {:>6.0f}ms | {:>9.0f}ms | {:>6.1f}x | {:>7.2f} MB |'.format(
+        train * 1000, load * 1000, train / load, size / 1e6))
+    print()
+
+
+def benchmark_parallel(copies=4):
+    """Compare training a Markov chain in one process against train_parallel
+    on a corpus of several copies of Dracula, and check they are identical."""
+    print('MarkovChain training: sequential vs train_parallel')
+    words = clean_corpus(CORPUS_PATH) * copies
+    print('{:,} words ({} copies of {})'.format(len(words), copies, CORPUS_PATH))
+    print('| order | workers | time    | speedup | identical |')
+    for order in (1, 2):
+        expected = MarkovChain(words, order=order)
+        sequential = time_it(lambda: MarkovChain(words, order=order), repeat=1)
+        print('| {:>5} | {:>7} | {:>6.2f}s | {:>6.1f}x | {!s:<9} |'.format(
+            order, 1, sequential, 1.0, True))
+        for workers in (2, 4):
+            chain = train_parallel(words, order=order, max_workers=workers)
+            parallel = time_it(lambda: train_parallel(words, order=order,
+                                                      max_workers=workers), repeat=1)
+            identical = (chain.vocab.words == expected.vocab.words
+                         and list(chain.markov_dict.items()) == list(expected.markov_dict.items())
+                         and list(chain.start_states.items()) == list(expected.start_states.items()))
+            print('| {:>5} | {:>7} | {:>6.2f}s | {:>6.1f}x | {!s:<9} |'.format(
+                order, workers, parallel, sequential / parallel, identical))
+    print()
+
+
+def benchmark_bulk_count():
+    """Compare counting the Dracula corpus with add_count one word at a time
+    against Dictogram.from_iterable."""
+    print('Dictogram: add_count per word vs from_iterable')
+    words = clean_corpus(CORPUS_PATH)
+
+    def count_one_at_a_time():
+        histogram = Dictogram()
+        for word in words:
+            histogram.add_count(word)
+
+    one_at_a_time = time_it(count_one_at_a_time)
+    bulk = time_it(lambda: Dictogram.from_iterable(words))
+    print('| words   | add_count | from_iterable | speedup |')
+    print('| {:>7,} | {:>7.1f}ms | {:>11.1f}ms | {:>6.1f}x |'.format(
+        len(words), one_at_a_time * 1000, bulk * 1000, one_at_a_time / bulk))
+    print()
+
+
+def benchmark_hashtable_scaling(fixed_limit=10000):
+    """Compare average time per set and get of a HashTable that resizes with
+    one that keeps its 8 buckets, from 10 to 1M keys. The fixed table only
+    goes up to fixed_limit keys, because each operation walks n / 8 entries."""
+    print('HashTable: resizing vs fixed 8 buckets, average time per operation')
+    print('| keys      | buckets   | resizing set | resizing get | fixed set   | fixed get   |')
+    for num_keys in (10, 100, 1000, 10000, 100000, 1000000):
+        keys = ['word{}'.format(i) for i in range(num_keys)]
+        columns = []
+        tables = [HashTable()]
+        if num_keys <= fixed_limit:
+            # a max load factor no table can reach keeps it at 8 buckets
+            tables.append(HashTable(max_load_factor=float('inf')))
+        for ht in tables:
+            start = time.perf_counter()
+            for key in keys:
+                ht.set(key, 1)
+            set_time = time.perf_counter() - start
+            start = time.perf_counter()
+            for key in keys:
+                ht.get(key)
+            get_time = time.perf_counter() - start
+            columns.append('{:.2f}us'.format(set_time / num_keys * 1e6))
+            columns.append('{:.2f}us'.format(get_time / num_keys * 1e6))
+        columns += ['-'] * (4 - len(columns))
+        print('| {:>9,} | {:>9,} | {:>12} | {:>12} | {:>11} | {:>11} |'.format(
+            num_keys, len(tables[0].buckets), *columns))
+    print()
+
+
+def benchmark_hashtable_bulk():
+    """Compare loading and looking up every word of the Dracula corpus in a
+    HashTable with one call per word against the bulk methods."""
+    words = clean_corpus(CORPUS_PATH)
+    pairs = [(word, i) for i, word in enumerate(words)]
+    print('HashTable: per key vs bulk methods ({:,} words, {:,} distinct)'.format(
+        len(words), len(set(words))))
+
+    def set_each():
+        ht = HashTable()
+        for key, value in pairs:
+            ht.set(key, value)
+
+    ht = HashTable.from_pairs(pairs)
+    print('| operation       | per key  | bulk     | speedup |')
+    for name, per_key, bulk in [
+            ('load', set_each, lambda: HashTable.from_pairs(pairs)),
+            ('update existing', lambda: [ht.set(key, value) for key, value in pairs],
+             lambda: ht.update(pairs)),
+            ('get', lambda: [ht.get(word) for word in words], lambda: ht.get_many(words)),
+            ('contains', lambda: [ht.contains(word) for word in words],
+             lambda: ht.contains_many(words))]:
+        per_key_time = time_it(per_key)
+        bulk_time = time_it(bulk)
+        print('| {:<15} | {:>6.1f}ms | {:>6.1f}ms | {:>6.1f}x |'.format(
+            name, per_key_time * 1000, bulk_time * 1000, per_key_time / bulk_time))
+    print()
+
+
+def benchmark_hash_functions():
+    """Compare how evenly the distinct words of the Dracula corpus spread
+    over HashTable buckets with the built-in hash, with a power-of-two mask,
+    and with the archive example's my_hash = len(key)."""
+    words = list(dict.fromkeys(clean_corpus(CORPUS_PATH)))
+    print('HashTable: bucket spread by hash function ({:,} distinct words)'.format(len(words)))
+    print('| hash function    | buckets | empty  | max chain | probes/get | get ops/s  |')
+    for name, options in [('hash, mod', {}),
+                          ('hash, mask', {'power_of_two': True}),
+                          ('len, mod', {'hash_function': len})]:
+        ht = HashTable.from_pairs(((word, 1) for word in words), track_probes=True, **options)
+        get_time = time_it(lambda: [ht.get(word) for word in words], repeat=1)
+        stats = ht.stats()
+        print('| {:<16} | {:>7,} | {:>6,} | {:>9,} | {:>10.1f} | {:>10,.0f} |'.format(
+            name, stats['buckets'], stats['empty_buckets'], stats['max_chain'],
+            stats['average_probes']['get'], len(words) / get_time))
+    print()
+
+
+def benchmark_listogram_index(linear_limit=40000):
+    """Compare build time of a Listogram with a linear search index_of
+    against an indexed Listogram, on more and more words of the Dracula
+    corpus. The linear Listogram is quadratic, so it stops at linear_limit."""
+    words = clean_corpus(CORPUS_PATH)
+    print('Listogram: build time, linear search vs indexed')
+    print('| words   | types  | linear    | indexed  |')
+    for num_words in (1000, 10000, linear_limit, len(words)):
+        indexed = time_it(lambda: Listogram(words[:num_words], indexed=True), repeat=1)
+        if num_words <= linear_limit:
+            linear = '{:.1f}ms'.format(
+                time_it(lambda: Listogram(words[:num_words]), repeat=1) * 1000)
+        else:
+            linear = '-'
+        print('| {:>7,} | {:>6,} | {:>9} | {:>6.1f}ms |'.format(
+            num_words, len(set(words[:num_words])), linear, indexed * 1000))
+    print()
+
+
+def benchmark_sorted_listogram(num_chapters=10):
+    """Compare counting the first chapters of Dracula into a histogram each,
+    merging them into one and looking up every word in it, with Listograms
+    (linear search), indexed Listograms and SortedListograms."""
+    with open(CORPUS_PATH, encoding='utf-8') as file:
+        chapters = re.split(r'^CHAPTER ', file.read(), flags=re.MULTILINE)
+    chapters = [text_cleaner._process_text(chapter) for chapter in chapters]
+    # skip the table of contents, which has a line per chapter
+    chapters = [chapter for chapter in chapters if len(chapter) > 1000][:num_chapters]
+    words = [word for chapter in chapters for word in chapter]
+    print('Listogram: {} chapter histograms merged ({:,} words)'.format(len(chapters), len(words)))
+    print('| listogram | count    | merge     | lookups   |')
+    for name, make in [('linear', Listogram),
+                       ('indexed', lambda words: Listogram(words, indexed=True)),
+                       ('sorted', SortedListogram)]:
+        count = time_it(lambda: [make(chapter) for chapter in chapters], repeat=1)
+        histograms = [make(chapter) for chapter in chapters]
+
+        def merge_all():
+            merged = make([])
+            for histogram in histograms:
+                merged.merge(histogram)
+            return merged
+
+        merge = time_it(merge_all, repeat=1)
+        merged = merge_all()
+        lookups = time_it(lambda: [merged.frequency(word) for word in words], repeat=1)
+        print('| {:<9} | {:>6.1f}ms | {:>7.1f}ms | {:>7.1f}ms |'.format(
+            name, count * 1000, merge * 1000, lookups * 1000))
+    print()
+
+
+def benchmark_frequency_listogram(draws=10000):
+    """Compare Listograms of the Dracula corpus in insertion order and in
+    descending order of count: build time, expected entries checked per
+    sample, and samples per second."""
+    words = clean_corpus(CORPUS_PATH)
+    print('Listogram: insertion order vs frequency order ({:,} words)'.format(len(words)))
+    print('| order     | build    | expected probes | draws/s  |')
+    for name, make in [('insertion', lambda: Listogram(words, indexed=True)),
+                       ('frequency', lambda: FrequencyListogram(words, indexed=True))]:
+        build = time_it(make, repeat=1)
+        histogram = make()
+        sample = time_it(lambda: [histogram.sample() for _ in range(draws)])
+        print('| {:<9} | {:>6.1f}ms | {:>15,.1f} | {:>8,.0f} |'.format(
+            name, build * 1000, histogram.expected_probes(), draws / sample))
+    print()
+
+
+def benchmark_open_hashtable():
+    """Compare throughput of set, get and delete and memory per entry of the
+    chained HashTable, OpenHashTable and the built-in dict, keyed by every
+    distinct word of the Dracula corpus."""
+    words = list(dict.fromkeys(clean_corpus(CORPUS_PATH)))
+    print('Chained vs open addressing hash table ({:,} distinct words)'.format(len(words)))
+
+    def build_dict():
+        table = {}
+        for word in words:
+            table[word] = 1
+        return table
+
+    def build(table_class):
+        def build_table():
+            table = table_class()
+            for word in words:
+                table.set(word, 1)
+            return table
+        return build_table
+
+    print('| table         | set ops/s  | get ops/s  | delete ops/s | bytes/entry |')
+    for name, build_table in [('HashTable', build(HashTable)),
+                              ('OpenHashTable', build(OpenHashTable)),
+                              ('dict', build_dict)]:
+        # memory held by the table, not counting the word strings it shares
+        tracemalloc.start()
+        table = build_table()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        set_time = time_it(build_table)
+        if isinstance(table, dict):
+            get_time = time_it(lambda: [table[word] for word in words])
+
+            def delete_all():
+                copy = build_dict()
+                start = time.perf_counter()
+                for word in words:
+                    del copy[word]
+                return time.perf_counter() - start
+        else:
+            get_time = time_it(lambda: [table.get(word) for word in words])
+
+            def delete_all():
+                copy = build_table()
+                start = time.perf_counter()
+                for word in words:
+                    copy.delete(word)
+                return time.perf_counter() - start
+        delete_time = min(delete_all() for _ in range(3))
+        print('| {:<13} | {:>10,.0f} | {:>10,.0f} | {:>12,.0f} | {:>11.1f} |'.format(
+            name, len(words) / set_time, len(words) / get_time,
+            len(words) / delete_time, memory / len(words)))
+    print()
+
+
+def benchmark_hashtable_iter(num_keys=1000000):
+    """Compare peak memory and time of summing the values of a HashTable
+    with num_keys entries through values() and items(), which build lists,
+    and through iter_values() and iter_items(), which stream them."""
+    print('HashTable: list vs lazy iteration over {:,} entries'.format(num_keys))
+    ht = HashTable()
+    for i in range(num_keys):
+        ht.set(i, i)
+    print('| method        | peak memory | time    |')
+    for name, function in [
+            ('values()', lambda: sum(ht.values())),
+            ('iter_values()', lambda: sum(ht.iter_values())),
+            ('items()', lambda: sum(value for key, value in ht.items())),
+            ('iter_items()', lambda: sum(value for key, value in ht.iter_items()))]:
+        memory = peak_memory(function)
+        print('| {:<13} | {:>8.1f} MB | {:>5.2f} s |'.format(
+            name, memory / 1e6, time_it(function, repeat=1)))
+    print()
+
+
+def benchmark_rehash_latency(num_keys=1000000):
+    """Compare the latency of each set into a HashTable that rehashes all
+    entries at once when it grows against one that rehashes incrementally."""
+    print('HashTable: full vs incremental rehashing, latency of {:,} sets'.format(num_keys))
+    print('| rehashing   | p50     | p99     | max       | total   |')
+    for name, incremental in [('full', False), ('incremental', True)]:
+        ht = HashTable(incremental=incremental)
+        latencies = []
+        clock = time.perf_counter_ns
+        # garbage collection of millions of nodes pauses for longer than a
+        # rehash, whatever kind, so keep it out of the measurements
+        gc.disable()
+        for i in range(num_keys):
+            start = clock()
+            ht.set(i, i)
+            latencies.append(clock() - start)
+        gc.enable()
+        latencies.sort()
+        print('| {:<11} | {:>5.2f}us | {:>5.2f}us | {:>7.1f}ms | {:>5.2f} s |'.format(
+            name, latencies[num_keys // 2] / 1000, latencies[num_keys * 99 // 100] / 1000,
+            latencies[-1] / 1e6, sum(latencies) / 1e9))
+    print()
+
+
+class LockedHashTable(object):
+    """HashTable guarded by one lock, the simplest thread-safe hash table."""
+
+    def __init__(self):
+        self.table = HashTable()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            return self.table.get(key)
+
+    def set(self, key, value):
+        with self.lock:
+            self.table.set(key, value)
+
+
+def benchmark_concurrent(num_ops=200000):
+    """Compare throughput of a mix of 90% gets and 10% sets, split over 1, 2,
+    4 and 8 threads, on a HashTable with one lock and a ConcurrentHashTable.
+    Threads only run Python code in parallel on builds without the GIL, so
+    elsewhere this shows how much the locks cost, not a speedup."""
+    print('HashTable with one lock vs ConcurrentHashTable ({:,} ops, {} CPUs)'.format(
+        num_ops, os.cpu_count()))
+    keys = ['word{}'.format(i) for i in range(10000)]
+    print('| threads | one lock ops/s | striped ops/s |')
+    for num_threads in (1, 2, 4, 8):
+        rates = []
+        for table_class in (LockedHashTable, ConcurrentHashTable):
+            ht = table_class()
+            for key in keys:
+                ht.set(key, 0)
+
+            def work(thread):
+                rng = random.Random(thread)
+                for i in range(num_ops // num_threads):
+                    key = keys[rng.randrange(len(keys))]
+                    if i % 10:
+                        ht.get(key)
+                    else:
+                        ht.set(key, i)
+
+            threads = [threading.Thread(target=work, args=(thread,))
+                       for thread in range(num_threads)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            rates.append(num_ops / (time.perf_counter() - start))
+        print('| {:>7} | {:>14,.0f} | {:>13,.0f} |'.format(num_threads, *rates))
+    print()
+
+
+class DictNode(object):
+    """Node the old way, with a per-instance __dict__ instead of __slots__."""
+
+    def __init__(self, data):
+        self.data = data
+        self.next = None
+
+
+def benchmark_node_memory(num_nodes=100000):
+    """Compare memory per node of a linked list of Nodes with __slots__
+    against nodes with a __dict__, and the time to iterate it."""
+    print('LinkedList: bytes per node, __dict__ vs __slots__ ({:,} nodes)'.format(num_nodes))
+    items = list(range(num_nodes))
+
+    def link(node_class):
+        # link nodes by hand, like LinkedList.append does
+        head = tail = node_class(items[0])
+        for item in items[1:]:
+            tail.next = node_class(item)
+            tail = tail.next
+        return head
+
+    print('| node      | bytes/node |')
+    for name, node_class in [('__dict__', DictNode), ('__slots__', Node)]:
+        tracemalloc.start()
+        head = link(node_class)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print('| {:<9} | {:>10.1f} |'.format(name, memory / num_nodes))
+        del head
+    ll = LinkedList(items)
+    print('Iterating: items() {:.1f}ms, iter() {:.1f}ms, first match with in {:.3f}ms'.format(
+        time_it(ll.items) * 1000, time_it(lambda: list(ll)) * 1000,
+        time_it(lambda: 10 in ll) * 1000))
+    print()
+
+
+BENCHMARKS = {
+    'sample': benchmark_sample,
+    'sample_many': benchmark_sample_many,
+    'order': benchmark_order,
+    'compile': benchmark_compile,
+    'stream': benchmark_stream,
+    'histogram_stream': benchmark_histogram_stream,
+    'frozen_histogram': benchmark_frozen_histogram,
+    'cleaner': benchmark_cleaner,
+    'cache': benchmark_cache,
+    'parallel': benchmark_parallel,
+    'bulk_count': benchmark_bulk_count,
+    'hashtable_scaling': benchmark_hashtable_scaling,
+    'hashtable_bulk': benchmark_hashtable_bulk,
+    'hash_functions': benchmark_hash_functions,
+    'open_hashtable': benchmark_open_hashtable,
+    'listogram_index': benchmark_listogram_index,
+    'sorted_listogram': benchmark_sorted_listogram,
+    'frequency_listogram': benchmark_frequency_listogram,
+    'hashtable_iter': benchmark_hashtable_iter,
+    'node_memory': benchmark_node_memory,
+    'rehash_latency': benchmark_rehash_latency,
+    'concurrent': benchmark_concurrent,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+
+
+if __name__ == '__main__':
+    main()
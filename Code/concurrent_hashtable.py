@@ -0,0 +1,129 @@
+#!python
+
+import threading
+
+from hashtable import HashTable
+
+
+class ConcurrentHashTable(object):
+    """ConcurrentHashTable has the same single-key methods as HashTable (set,
+    get, contains, delete, length and iteration, but not the bulk methods or
+    stats) and is safe to use from many threads at once, such as the workers
+    of a threaded web server.
+
+    Its entries are split by hash code into num_stripes stripes, and each stripe
+    is an ordinary HashTable guarded by its own lock (lock striping). Threads
+    working on keys in different stripes never wait for each other, and a stripe
+    resizes its own buckets while holding only its own lock."""
+
+    def __init__(self, init_size=8, max_load_factor=0.75, min_load_factor=None,
+                 num_stripes=31):
+        """Initialize this hash table with about init_size buckets in total,
+        split over num_stripes stripes. num_stripes must be odd: each stripe's
+        initial size is rounded up to a power of two, so its bucket count
+        always is one, and an odd stripe count shares no factor with it, so
+        keys in the same stripe still spread over all of its buckets."""
+        if num_stripes < 1 or num_stripes % 2 == 0:
+            raise ValueError('num_stripes must be odd: {}'.format(num_stripes))
+        self.num_stripes = num_stripes
+        stripe_size = 1
+        while stripe_size * num_stripes < init_size:
+            stripe_size *= 2
+        self.stripes = [HashTable(stripe_size, max_load_factor, min_load_factor)
+                        for i in range(num_stripes)]
+        self.locks = [threading.Lock() for i in range(num_stripes)]
+
+    def __str__(self):
+        """Return a formatted string representation of this hash table."""
+        items = ('{!r}: {!r}'.format(key, val) for key, val in self.iter_items())
+        return '{' + ', '.join(items) + '}'
+
+    def __repr__(self):
+        """Return a string representation of this hash table."""
+        return 'ConcurrentHashTable([' + ', '.join(map(repr, self.iter_items())) + '])'
+
+    def __iter__(self):
+        """Return an iterator over the keys of this hash table, like a dict."""
+        return self.iter_keys()
+
+    def __len__(self):
+        """Return the number of key-value entries, so len(ht) works."""
+        return self.length()
+
+    def _stripe_index(self, key):
+        """Return the index of the stripe (and lock) the given key belongs to."""
+        return hash(key) % self.num_stripes
+
+    def load_factor(self):
+        """Return the load factor, the average number of entries per bucket
+        over all stripes. Other threads may change it as soon as it returns."""
+        buckets = sum(len(stripe.buckets) for stripe in self.stripes)
+        return self.length() / buckets
+
+    def iter_items(self):
+        """Yield each item (key-value pair) in this hash table, one at a time.
+        Each stripe's items are copied while holding its lock, so iterating
+        never blocks other threads for long and is safe while they change the
+        table, but changes made during iteration may or may not be seen.
+        Running time: O(n + b) for n entries and b buckets to yield them all,
+        and O(n / s) extra memory for s stripes."""
+        for lock, stripe in zip(self.locks, self.stripes):
+            with lock:
+                items = stripe.items()
+            yield from items
+
+    def iter_keys(self):
+        """Yield each key in this hash table, one at a time, see iter_items."""
+        for key, value in self.iter_items():
+            yield key
+
+    def iter_values(self):
+        """Yield each value in this hash table, one at a time, see iter_items."""
+        for key, value in self.iter_items():
+            yield value
+
+    def keys(self):
+        """Return a list of all keys in this hash table."""
+        return list(self.iter_keys())
+
+    def values(self):
+        """Return a list of all values in this hash table."""
+        return list(self.iter_values())
+
+    def items(self):
+        """Return a list of all items (key-value pairs) in this hash table."""
+        return list(self.iter_items())
+
+    def length(self):
+        """Return the number of key-value entries.
+        Running time: O(s) for s stripes, which each track their own length.
+        Reading an int is atomic, so this doesn't need the locks."""
+        return sum(stripe.size for stripe in self.stripes)
+
+    def contains(self, key):
+        """Return True if this hash table contains the given key, or False.
+        Running time: O(1) on average, same as HashTable."""
+        index = self._stripe_index(key)
+        with self.locks[index]:
+            return self.stripes[index].contains(key)
+
+    def get(self, key):
+        """Return the value associated with the given key, or raise KeyError.
+        Running time: O(1) on average, same as HashTable."""
+        index = self._stripe_index(key)
+        with self.locks[index]:
+            return self.stripes[index].get(key)
+
+    def set(self, key, value):
+        """Insert or update the given key with its associated value.
+        Running time: O(1) on average (amortized over resizes of its stripe)."""
+        index = self._stripe_index(key)
+        with self.locks[index]:
+            self.stripes[index].set(key, value)
+
+    def delete(self, key):
+        """Delete the given key from this hash table, or raise KeyError.
+        Running time: O(1) on average (amortized over resizes of its stripe)."""
+        index = self._stripe_index(key)
+        with self.locks[index]:
+            self.stripes[index].delete(key)
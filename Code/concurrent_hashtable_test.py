@@ -0,0 +1,115 @@
+#!python
+
+from concurrent_hashtable import ConcurrentHashTable
+import sys
+import threading
+import unittest
+
+
+class ConcurrentHashTableTest(unittest.TestCase):
+
+    def test_init(self):
+        ht = ConcurrentHashTable(num_stripes=5)
+        assert len(ht.stripes) == 5
+        assert len(ht.locks) == 5
+        assert ht.length() == 0
+        with self.assertRaises(ValueError):
+            ConcurrentHashTable(num_stripes=4)  # Must be odd
+
+    def test_set_get_delete(self):
+        ht = ConcurrentHashTable()
+        ht.set('I', 1)
+        ht.set('V', 4)
+        ht.set('V', 5)  # Update value
+        ht.set('X', 10)
+        assert ht.get('I') == 1
+        assert ht.get('V') == 5
+        assert ht.length() == 3
+        assert len(ht) == 3
+        assert ht.contains('X') is True
+        self.assertCountEqual(ht.keys(), ['I', 'V', 'X'])
+        self.assertCountEqual(ht.values(), [1, 5, 10])
+        self.assertCountEqual(ht, ['I', 'V', 'X'])
+        ht.delete('X')
+        assert ht.contains('X') is False
+        self.assertCountEqual(ht.items(), [('I', 1), ('V', 5)])
+        assert repr(ht) == 'ConcurrentHashTable({!r})'.format(ht.items())
+        with self.assertRaises(KeyError):
+            ht.get('X')  # Key no longer exists
+        with self.assertRaises(KeyError):
+            ht.delete('X')  # Key no longer exists
+
+    def test_stripes_resize(self):
+        ht = ConcurrentHashTable(num_stripes=3)
+        for i in range(1000):
+            ht.set(i, i)
+        for stripe in ht.stripes:
+            assert stripe.load_factor() <= 0.75
+            # keys in a stripe spread over its buckets
+            used = sum(1 for bucket in stripe.buckets if bucket.length() > 0)
+            assert used >= stripe.length() // 2
+        assert ht.load_factor() <= 0.75
+
+    def test_stripe_size_power_of_two(self):
+        # 9 buckets over 3 stripes rounds up to 4 buckets per stripe, so the
+        # stripe count shares no factor with any stripe's bucket count
+        ht = ConcurrentHashTable(init_size=9, num_stripes=3)
+        assert [len(stripe.buckets) for stripe in ht.stripes] == [4, 4, 4]
+        for i in range(3000):
+            ht.set(i, i)
+        for stripe in ht.stripes:
+            used = sum(1 for bucket in stripe.buckets if bucket.length() > 0)
+            assert used == stripe.length()  # One key per bucket
+
+    def test_threads(self):
+        ht = ConcurrentHashTable(num_stripes=7)
+        num_threads = 8
+        num_keys = 2000
+        errors = []
+        start = threading.Barrier(num_threads)
+
+        def work(thread):
+            try:
+                start.wait()
+                # keys of this thread, set, updated and half deleted
+                for i in range(num_keys):
+                    ht.set((thread, i), i)
+                for i in range(num_keys):
+                    ht.set((thread, i), ht.get((thread, i)) + 1)
+                for i in range(0, num_keys, 2):
+                    ht.delete((thread, i))
+                # keys shared by all threads, each set by all of them
+                for i in range(num_keys):
+                    ht.set(('shared', i), thread)
+                    ht.contains(('shared', i))
+                    ht.length()
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=work, args=(thread,))
+                   for thread in range(num_threads)]
+        # switch threads as often as possible, so races would show up
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        assert errors == []
+        assert ht.length() == num_threads * num_keys // 2 + num_keys
+        for thread in range(num_threads):
+            for i in range(num_keys):
+                if i % 2:
+                    assert ht.get((thread, i)) == i + 1
+                else:
+                    assert ht.contains((thread, i)) is False
+        for i in range(num_keys):
+            assert ht.get(('shared', i)) in range(num_threads)
+        assert len(ht.items()) == ht.length()
+
+
+if __name__ == '__main__':
+    unittest.main()
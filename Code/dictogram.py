@@ -1,7 +1,18 @@
 #!python
 
 from __future__ import division, print_function  # Python 2 and 3 compatibility
+from bisect import bisect_left
+import itertools
+from operator import itemgetter
 import random
+try:
+    # C-accelerated counting loop behind collections.Counter
+    from collections import _count_elements
+except ImportError:
+    def _count_elements(mapping, iterable):
+        """Count elements of iterable into mapping, like collections.Counter."""
+        for element in iterable:
+            mapping[element] = mapping.get(element, 0) + 1
 
 
 class Dictogram(dict):
@@ -14,10 +25,21 @@ class Dictogram(dict):
         # Add properties to track useful word counts for this histogram
         self.types = 0  # Count of distinct word types in this histogram
         self.tokens = 0  # Total count of all word tokens in this histogram
+        # Sampling index: parallel lists of words and their running totals,
+        # built lazily by sample() and set back to None when it goes stale
+        self._sample_words = None
+        self._cumulative = None
         # Count words in given list, if any
         if word_list is not None:
-            for word in word_list:
-                self.add_count(word)
+            self.update(word_list)
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        """Return a new histogram of the words in given iterable, counted in
+        one fast pass (see update)."""
+        histogram = cls()
+        histogram.update(iterable)
+        return histogram
 
     def add_count(self, word, count=1):
         """Increase frequency count of given word by given count amount."""
@@ -25,14 +47,56 @@ class Dictogram(dict):
          # if word exists, increase its count
         if word in self:
             self[word] += count
+            # every running total from this word onward just shifted, so the
+            # sampling index has to be rebuilt on the next sample
+            self._cumulative = None
         else:
             # if word doesn't exist, add it with initial count
             self[word] = count
             self.types += 1
+            # a new word lands at the end of the dict, so the sampling index
+            # (if built) only needs one more running total appended to it
+            if self._cumulative is not None:
+                self._sample_words.append(word)
+                self._cumulative.append(self.tokens + count)
         # always increase tokens, need total words to create ratio + probability
         self.tokens += count
 
 
+    def update(self, iterable):
+        """Count each word in given iterable of words into this histogram, or
+        add the counts of a histogram if given a dict (like Counter.update).
+        Running time: O(n) for n words, but much faster than calling
+        add_count n times, because the counting loop runs in C and types and
+        tokens are only updated once at the end."""
+        if isinstance(iterable, dict):
+            self.merge(iterable)
+            return
+        # count the words as they go by: zip takes a word before it advances
+        # the counter, so the counter ends at the number of words counted
+        counter = itertools.count()
+        _count_elements(self, map(itemgetter(0), zip(iterable, counter)))
+        self.types = len(self)
+        self.tokens += next(counter)
+        # counts may have changed anywhere, so rebuild the sampling index later
+        self._cumulative = None
+
+    def merge(self, other):
+        """Add the counts of another histogram (a Dictogram, a Listogram or any
+        iterable of (word, count) pairs) into this histogram. Words new to
+        this histogram are added in the order they appear in the other one.
+        Running time: O(m) for m word types in the other histogram."""
+        pairs = other.items() if isinstance(other, dict) else other
+        tokens = 0
+        for word, count in pairs:
+            self[word] = self.get(word, 0) + count
+            tokens += count
+        self.types = len(self)
+        self.tokens += tokens
+        # counts may have changed anywhere, so rebuild the sampling index later
+        self._cumulative = None
+
+
     def frequency(self, word):
         """Return frequency count of given word, or 0 if word is not found."""
         # TODO: Retrieve word frequency count
@@ -43,21 +107,51 @@ class Dictogram(dict):
 
     def sample(self):
         """Return a word from this histogram, randomly sampled by weighting
-        each word's probability of being chosen by its observed frequency."""
-        # TODO: Randomly choose a word based on its frequency in this histogram
+        each word's probability of being chosen by its observed frequency.
+        Running time: O(log n) for n word types once the sampling index is
+        built, because we binary search the running totals instead of
+        walking every entry. The first call after an update is O(n)."""
+        if self._cumulative is None:
+            self._build_sample_index()
         # get total number of words to use in range
-        total_tokens = self.tokens
-        random_value = random.randint(1, total_tokens)
-        cumulative = 0
+        random_value = random.randint(1, self.tokens)
+        # running totals are sorted, so the first total that reaches
+        # random_value belongs to the chosen word (same word the old linear
+        # scan over .items() would have stopped at)
+        index = bisect_left(self._cumulative, random_value)
+        return self._sample_words[index]
+
+    def sample_many(self, k, rng=None):
+        """Return a list of k words from this histogram, each randomly sampled
+        by weighting its probability of being chosen by its frequency.
+        Pass a random.Random instance as rng for reproducible samples.
+        Raises ValueError if this histogram is empty and k is positive.
+        Running time: O(n + k log n) for n word types, because every draw
+        binary searches the same running totals inside random.choices."""
+        if not self:
+            # random.choices can't draw from nothing, even zero times
+            if k > 0:
+                raise ValueError('Cannot sample from an empty histogram')
+            return []
+        if rng is None:
+            rng = random
+        if self._cumulative is None:
+            self._build_sample_index()
+        return rng.choices(self._sample_words, cum_weights=self._cumulative, k=k)
+
+    def _build_sample_index(self):
+        """Build parallel lists of words and running totals of their counts,
+        in the same order as .items(), for binary search in sample()."""
+        words = []
+        cumulative = []
+        total = 0
         # dict method .items() returns key/value pairs as tuples of the 2 items
         for word, count in self.items():
-        # cumulative now = count in the tuple
-            cumulative += count
-        # if cumulative is larger than random_value, return the word
-        # more frequent words get larger ranges
-            if random_value <= cumulative:
-                return word
-
+            total += count
+            words.append(word)
+            cumulative.append(total)
+        self._sample_words = words
+        self._cumulative = cumulative
 
 
 def print_histogram(word_list):
@@ -78,7 +172,7 @@ def print_histogram(word_list):
 def print_histogram_samples(histogram):
     print('Histogram samples:')
     # Sample the histogram 10,000 times and count frequency of results
-    samples_list = [histogram.sample() for _ in range(10000)]
+    samples_list = histogram.sample_many(10000)
     samples_hist = Dictogram(samples_list)
     print('samples: {}'.format(samples_hist))
     print()
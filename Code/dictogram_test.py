@@ -1,6 +1,7 @@
 #!python
 
 from dictogram import Dictogram
+import random
 import unittest
 # Python 2 and 3 compatibility: unittest module renamed this assertion method
 if not hasattr(unittest.TestCase, 'assertCountEqual'):
@@ -83,6 +84,47 @@ class DictogramTest(unittest.TestCase):
             histogram.add_count(word)
         assert histogram.types == 5
 
+    def test_from_iterable(self):
+        histogram = Dictogram.from_iterable(iter(self.fish_words))
+        # Counting in bulk should match counting one word at a time
+        assert list(histogram.items()) == self.fish_list
+        assert histogram.types == 5
+        assert histogram.tokens == 8
+
+    def test_update(self):
+        histogram = Dictogram(self.fish_words)
+        # Update should count more words, like calling add_count on each
+        histogram.update(['fish', 'food', 'food'])
+        assert histogram.frequency('fish') == 5
+        assert histogram.frequency('food') == 2
+        assert histogram.types == 6
+        assert histogram.tokens == 11
+        # Update with a histogram should add its counts
+        histogram.update(Dictogram(['food']))
+        assert histogram.frequency('food') == 3
+        assert histogram.tokens == 12
+        # Update with a generator should count each word it yields once
+        histogram.update(word for word in ['red', 'fish'])
+        assert histogram.tokens == 14
+        histogram.update(iter([]))
+        assert histogram.tokens == 14
+        assert histogram.tokens == sum(histogram.values())
+
+    def test_merge(self):
+        histogram = Dictogram(self.fish_words[:4])
+        other = Dictogram(self.fish_words[4:])
+        # Merging should add counts as if all words were counted together
+        histogram.merge(other)
+        assert list(histogram.items()) == self.fish_list
+        assert histogram.types == 5
+        assert histogram.tokens == 8
+        # Merging (word, count) pairs should work too
+        histogram.merge([('fish', 2), ('food', 1)])
+        assert histogram.frequency('fish') == 6
+        assert histogram.frequency('food') == 1
+        assert histogram.types == 6
+        assert histogram.tokens == 11
+
     def test_sample(self):
         histogram = Dictogram(self.fish_words)
         # Create a list of 10,000 word samples from histogram
@@ -101,6 +143,52 @@ class DictogramTest(unittest.TestCase):
             upper_bound = observed_freq * 1.1  # 10% above = 110% = 1.1
             assert lower_bound <= sampled_freq <= upper_bound
 
+    def test_sample_after_add_count(self):
+        histogram = Dictogram(self.fish_words)
+        histogram.sample()  # Build the sampling index
+        # Updating counts after sampling should be reflected in new samples
+        histogram.add_count('one', 4)  # Existing word
+        histogram.add_count('food', 8)  # New word
+        samples_hist = Dictogram([histogram.sample() for _ in range(10000)])
+        # Check the words whose counts changed
+        for word in ('one', 'food'):
+            observed_freq = histogram.frequency(word) / histogram.tokens
+            sampled_freq = samples_hist.frequency(word) / samples_hist.tokens
+            assert observed_freq * 0.9 <= sampled_freq <= observed_freq * 1.1
+
+    def test_sample_never_returns_none(self):
+        histogram = Dictogram(['one'])
+        for word in ['two', 'three', 'two']:
+            histogram.add_count(word)
+            assert histogram.sample() in histogram
+
+    def test_sample_many(self):
+        histogram = Dictogram(self.fish_words)
+        # Draw 10,000 word samples from histogram in one call
+        samples_list = histogram.sample_many(10000)
+        assert len(samples_list) == 10000
+        samples_hist = Dictogram(samples_list)
+        # Check each word in original histogram
+        for word, count in histogram.items():
+            observed_freq = count / histogram.tokens
+            sampled_freq = samples_hist.frequency(word) / samples_hist.tokens
+            assert observed_freq * 0.9 <= sampled_freq <= observed_freq * 1.1
+
+    def test_sample_many_with_rng(self):
+        histogram = Dictogram(self.fish_words)
+        # Samples from generators with the same seed should be identical
+        samples1 = histogram.sample_many(100, rng=random.Random(1120))
+        samples2 = histogram.sample_many(100, rng=random.Random(1120))
+        assert samples1 == samples2
+        assert histogram.sample_many(0) == []
+
+    def test_sample_many_empty(self):
+        histogram = Dictogram()
+        # Drawing nothing from an empty histogram is fine, drawing words isn't
+        assert histogram.sample_many(0) == []
+        with self.assertRaises(ValueError):
+            histogram.sample_many(1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,128 @@
+#!python
+
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+import random
+import sys
+
+from histogram import count_words
+
+
+class FrozenHistogram(object):
+    """FrozenHistogram is a read-only histogram stored compactly: the words in
+    one sorted list, and their counts (and running totals of the counts) in
+    arrays of machine ints, instead of a (word, count) tuple and an int object
+    per word. Words are found by binary search, words with a given prefix are
+    one range of the list, and sampling is a binary search of the totals."""
+
+    def __init__(self, histogram=None):
+        """Initialize this histogram from another histogram: a dict (such as a
+        Dictogram), a Listogram, or any iterable of (word, count) pairs.
+        Counts of a word that appears in more than one pair are added, like
+        Dictogram.merge does."""
+        if not isinstance(histogram, dict):
+            counts = {}
+            for word, count in histogram or []:
+                counts[word] = counts.get(word, 0) + count
+            histogram = counts
+        # sorted list of words, and each word's count at the same index
+        self.words = sorted(histogram)
+        self.counts = array('l', map(histogram.__getitem__, self.words))
+        # running total of the counts up to and including each index
+        self.cumulative = array('q', accumulate(self.counts))
+        total = self.cumulative[-1] if self.counts else 0
+        # count of distinct word types in this histogram
+        self.types = len(self.words)
+        # total count of all words in this histogram
+        self.tokens = total
+
+    @classmethod
+    def from_source(cls, source_text):
+        """Return a FrozenHistogram of the lowercased words in source text, a
+        .txt file path or an iterable of words, counted like histogram.histogram."""
+        return cls(count_words(source_text))
+
+    def __len__(self):
+        """Return the number of distinct words in this histogram."""
+        return self.types
+
+    def __iter__(self):
+        """Yield each (word, count) entry in sorted order of words."""
+        return zip(self.words, self.counts)
+
+    def __contains__(self, word):
+        """Return True if given word is in this histogram."""
+        return self.index_of(word) is not None
+
+    def __repr__(self):
+        """Return a string representation of this histogram."""
+        return 'FrozenHistogram({!r})'.format(list(self))
+
+    def items(self):
+        """Return a list of (word, count) entries in sorted order of words."""
+        return list(self)
+
+    def index_of(self, word):
+        """Return the index of given word, or None if it is not found.
+        Running time: O(log n) for n word types, by binary search."""
+        index = bisect_left(self.words, word)
+        if index < self.types and self.words[index] == word:
+            return index
+        return None
+
+    def frequency(self, word):
+        """Return frequency count of given word, or 0 if word is not found.
+        Running time: O(log n) for n word types."""
+        index = self.index_of(word)
+        return self.counts[index] if index is not None else 0
+
+    def _prefix_range(self, prefix):
+        """Return the start and end indexes of the words that begin with the
+        given prefix. They are next to each other, because words are sorted."""
+        start = bisect_left(self.words, prefix)
+        # every word with the prefix sorts before the prefix with its last
+        # character replaced by the next one ('vamp' -> 'vamq'). The last
+        # code point has no next one, so drop it and bump the one before.
+        upper = prefix.rstrip(chr(sys.maxunicode))
+        if not upper:
+            return start, self.types
+        upper = upper[:-1] + chr(ord(upper[-1]) + 1)
+        return start, bisect_left(self.words, upper, start)
+
+    def prefix(self, prefix):
+        """Return a list of (word, count) entries of every word that begins
+        with the given prefix, in sorted order.
+        Running time: O(log n + k) for k matching words."""
+        start, end = self._prefix_range(prefix)
+        return list(zip(self.words[start:end], self.counts[start:end]))
+
+    def prefix_count(self, prefix):
+        """Return the total count of the words that begin with the given
+        prefix. Running time: O(log n), the difference of two running totals."""
+        start, end = self._prefix_range(prefix)
+        if start == end:
+            return 0
+        return self.cumulative[end - 1] - (self.cumulative[start - 1] if start else 0)
+
+    def sample(self):
+        """Return a word from this histogram, randomly sampled by weighting
+        each word's probability of being chosen by its observed frequency.
+        Running time: O(log n), by binary search of the running totals."""
+        random_value = random.randint(1, self.tokens)
+        return self.words[bisect_left(self.cumulative, random_value)]
+
+    def sample_many(self, k, rng=None):
+        """Return a list of k words from this histogram, each randomly sampled
+        by weighting its probability of being chosen by its frequency.
+        Pass a random.Random instance as rng for reproducible samples.
+        Raises ValueError if this histogram is empty and k is positive.
+        Running time: O(k log n), the running totals are already there."""
+        if not self.types:
+            # random.choices can't draw from nothing, even zero times
+            if k > 0:
+                raise ValueError('Cannot sample from an empty histogram')
+            return []
+        if rng is None:
+            rng = random
+        return rng.choices(self.words, cum_weights=self.cumulative, k=k)
@@ -0,0 +1,89 @@
+#!python
+
+from dictogram import Dictogram
+from frozen_histogram import FrozenHistogram
+from listogram import Listogram
+import random
+import sys
+import unittest
+
+
+class FrozenHistogramTest(unittest.TestCase):
+
+    # Test fixtures: known inputs and their expected results
+    fish_words = ['one', 'fish', 'two', 'fish', 'red', 'fish', 'blue', 'fish']
+    fish_list = [('blue', 1), ('fish', 4), ('one', 1), ('red', 1), ('two', 1)]
+
+    def test_init(self):
+        for source in (Dictogram(self.fish_words), Listogram(self.fish_words),
+                       dict(self.fish_list), reversed(self.fish_list)):
+            histogram = FrozenHistogram(source)
+            assert histogram.items() == self.fish_list  # Sorted by word
+            assert histogram.types == 5
+            assert histogram.tokens == 8
+        assert list(histogram.counts) == [1, 4, 1, 1, 1]
+        assert list(histogram.cumulative) == [1, 5, 6, 7, 8]
+        assert len(FrozenHistogram()) == 0
+
+    def test_init_duplicate_words(self):
+        # counts of a repeated word are added, like Dictogram.merge
+        histogram = FrozenHistogram([('a', 1), ('b', 3), ('a', 2)])
+        assert histogram.items() == [('a', 3), ('b', 3)]
+        assert histogram.tokens == 6
+
+    def test_from_source(self):
+        histogram = FrozenHistogram.from_source('One fish two FISH')
+        assert histogram.items() == [('fish', 2), ('one', 1), ('two', 1)]
+
+    def test_frequency(self):
+        histogram = FrozenHistogram(Dictogram(self.fish_words))
+        assert histogram.frequency('fish') == 4
+        assert histogram.frequency('blue') == 1  # First entry
+        assert histogram.frequency('two') == 1  # Last entry
+        assert histogram.frequency('food') == 0
+        assert histogram.frequency('zebra') == 0  # Past the last entry
+        assert 'red' in histogram
+        assert 'fishy' not in histogram
+
+    def test_prefix(self):
+        histogram = FrozenHistogram([('vamp', 1), ('vampire', 3), ('vampires', 2),
+                                     ('van', 5), ('vamoose', 1), ('a', 4)])
+        assert histogram.prefix('vamp') == [('vamp', 1), ('vampire', 3), ('vampires', 2)]
+        assert histogram.prefix_count('vamp') == 6
+        assert histogram.prefix_count('va') == 12
+        assert histogram.prefix_count('a') == 4  # First entry
+        assert histogram.prefix('vz') == []
+        assert histogram.prefix_count('vz') == 0
+        assert histogram.prefix_count('') == histogram.tokens
+
+    def test_prefix_last_code_point(self):
+        last = chr(sys.maxunicode)
+        histogram = FrozenHistogram([('a', 1), ('a' + last, 2), ('a' + last + 'b', 3),
+                                     ('b', 4), (last, 5), (last + last, 6)])
+        assert histogram.prefix('a' + last) == [('a' + last, 2), ('a' + last + 'b', 3)]
+        assert histogram.prefix_count(last) == 11
+        assert histogram.prefix_count(last + last) == 6
+
+    def test_sample(self):
+        histogram = FrozenHistogram(Dictogram(self.fish_words))
+        samples = Dictogram(histogram.sample() for _ in range(10000))
+        assert set(samples) == set(self.fish_words)
+        # 'fish' is half of the words, so about half of the samples
+        assert 0.45 < samples['fish'] / 10000 < 0.55
+
+    def test_sample_many(self):
+        histogram = FrozenHistogram(Dictogram(self.fish_words))
+        samples = histogram.sample_many(10000, rng=random.Random(1))
+        assert samples == histogram.sample_many(10000, rng=random.Random(1))
+        assert 0.45 < samples.count('fish') / 10000 < 0.55
+
+    def test_sample_many_empty(self):
+        histogram = FrozenHistogram()
+        # Drawing nothing from an empty histogram is fine, drawing words isn't
+        assert histogram.sample_many(0) == []
+        with self.assertRaises(ValueError):
+            histogram.sample_many(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,137 +1,462 @@
 #!python
 
+from functools import partial
+
 from linkedlist import LinkedList
 
+# number of old buckets each operation moves while rehashing incrementally.
+# Growing from n to 2n buckets happens at 0.75n entries and the next grow at
+# 1.5n, so moving 2 buckets per set would just finish in time, 4 leaves room.
+REHASH_STEP = 4
+
+
+# Variants of HashTable methods that __init__ picks once for a table, bound to
+# what they need with functools.partial. They're functions, not methods, so a
+# table doesn't hold methods bound to itself (a reference cycle, and copies of
+# the table would keep calling the original's methods).
+
+def _mod_index(hash_function, key, num_buckets):
+    """Same as HashTable._bucket_index, but with the given hash function.
+    Used as _bucket_index if hash_function isn't the built-in hash."""
+    return hash_function(key) % num_buckets
+
+
+def _mask_index(hash_function, key, num_buckets):
+    """Return the bucket index where the given key would be stored, out of
+    num_buckets buckets, a power of two: the low bits of its hash code.
+    Used as _bucket_index if power_of_two is set."""
+    return hash_function(key) & (num_buckets - 1)
+
+
+def _find_entry_counted(operations, probes, bucket, key, operation):
+    """Same as HashTable._find_entry, but also count the call and the number
+    of entries it compared under the given operation name in the operations
+    and probes dicts, for stats(). Used as _find_entry if track_probes is set."""
+    compared = 0  # Number of entries compared
+    previous = None
+    node = bucket.head
+    while node is not None:
+        compared += 1
+        if node.data[0] == key:
+            break
+        previous = node
+        node = node.next
+    operations[operation] = operations.get(operation, 0) + 1
+    probes[operation] = probes.get(operation, 0) + compared
+    return previous, node
+
 
 class HashTable(object):
 
-    def __init__(self, init_size=8):
-        """Initialize this hash table with the given initial size."""
+    def __init__(self, init_size=8, max_load_factor=0.75, min_load_factor=None,
+                 incremental=False, hash_function=hash, power_of_two=False,
+                 track_probes=False):
+        """Initialize this hash table with the given initial size.
+        The number of buckets doubles when the load factor (entries per bucket)
+        goes above max_load_factor, and halves (but not below init_size) when a
+        delete takes it below min_load_factor, if that is given.
+        If incremental is True, entries move to the new buckets a few at a time
+        over the following operations (like Redis does) instead of all at once,
+        so no single operation takes O(n) time.
+        hash_function maps each key to an int hash code (the built-in hash by
+        default). If power_of_two is True, the number of buckets is rounded up
+        to a power of two and the bucket index is the low bits of the hash
+        code (a bit mask, faster than mod), which needs a hash function that
+        mixes its low bits well. If track_probes is True, every operation
+        counts how many entries it compared, reported by stats()."""
+        if min_load_factor is not None and min_load_factor * 4 > max_load_factor:
+            # a delete that halves the buckets just under min_load_factor leaves
+            # the load factor just under 2 * min_load_factor, at most half of
+            # max_load_factor, so entries have to double before it grows back
+            raise ValueError('min_load_factor must be at most max_load_factor / 4')
+        if power_of_two:
+            size = 1
+            while size < init_size:
+                size *= 2
+            init_size = size
+        self.init_size = init_size
+        self.hash_function = hash_function
+        self.power_of_two = power_of_two
+        # Pick how to turn keys into bucket indexes once, instead of checking
+        # on every lookup. The default calls the built-in hash directly, which
+        # is faster than calling it through an attribute.
+        if power_of_two:
+            self._bucket_index = partial(_mask_index, hash_function)
+        elif hash_function is not hash:
+            self._bucket_index = partial(_mod_index, hash_function)
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        # Count of key-value entries, kept up to date by set and delete
+        self.size = 0
         # Create a new list (used as fixed-size array) of empty linked lists
         # each bucket is a linked list that can store multiple items
         self.buckets = []
         for i in range(init_size):
             self.buckets.append(LinkedList())
+        self.incremental = incremental
+        # While rehashing incrementally, the buckets entries are moving out of,
+        # and the index of the next one to move. Old buckets before that index
+        # have been moved and the new buckets they moved to have been created,
+        # the rest of the new buckets are still None.
+        self._old_buckets = None
+        self._rehash_index = 0
+        # Number of running iterators, which pause incremental rehashing so
+        # entries don't move under them
+        self._iterators = 0
+        # Number of calls and of entries compared by each kind of operation.
+        # Counting them has its own bucket walk, so untracked tables don't pay
+        # for it.
+        self._operations = {} if track_probes else None
+        self._probes = {} if track_probes else None
+        if track_probes:
+            self._find_entry = partial(_find_entry_counted, self._operations, self._probes)
 
     def __str__(self):
         """Return a formatted string representation of this hash table."""
-        items = []
-        for key, val in self.items():
-            items.append('{!r}: {!r}'.format(key, val))
+        items = ('{!r}: {!r}'.format(key, val) for key, val in self.iter_items())
         return '{' + ', '.join(items) + '}'
 
     def __repr__(self):
         """Return a string representation of this hash table."""
-        return 'HashTable({!r})'.format(self.items())
+        return 'HashTable([' + ', '.join(map(repr, self.iter_items())) + '])'
+
+    def __iter__(self):
+        """Return an iterator over the keys of this hash table, like a dict."""
+        return self.iter_keys()
+
+    def __len__(self):
+        """Return the number of key-value entries, so len(ht) works.
+        Running time: O(1) because the number of entries is tracked."""
+        return self.size
+
+    def _bucket_index(self, key, num_buckets):
+        """Return the bucket index where the given key would be stored, out of
+        num_buckets buckets: its built-in hash code mod num_buckets."""
+        return hash(key) % num_buckets
+
+    def load_factor(self):
+        """Return the load factor, the average number of entries per bucket.
+        Running time: O(1) because the number of entries is tracked."""
+        return self.size / len(self.buckets)
+
+    def stats(self):
+        """Return a dict of statistics that show how evenly keys are spread
+        over the buckets: the number of entries and buckets, the load factor,
+        the longest chain (bucket length), the number of empty buckets and
+        a histogram of how many buckets have each chain length. If probes are
+        tracked, it also has the number of calls of each operation and the
+        average number of entries each call compared. Bulk operations
+        (get_many, contains_many and update) count one call per distinct key
+        they look up.
+        Running time: O(n + b) for n entries and b buckets."""
+        chain_lengths = {}
+        buckets = [bucket for bucket in self.buckets if bucket is not None]
+        if self._old_buckets is not None:
+            buckets.extend(self._old_buckets[self._rehash_index:])
+        for bucket in buckets:
+            length = len(bucket)
+            chain_lengths[length] = chain_lengths.get(length, 0) + 1
+        stats = {
+            'entries': self.size,
+            'buckets': len(self.buckets),
+            'load_factor': self.load_factor(),
+            'max_chain': max(chain_lengths),
+            'empty_buckets': chain_lengths.get(0, 0),
+            'chain_lengths': dict(sorted(chain_lengths.items())),
+        }
+        if self._probes is not None:
+            stats['operations'] = dict(self._operations)
+            stats['average_probes'] = {operation: self._probes[operation] / count
+                                       for operation, count in self._operations.items()}
+        return stats
+
+    def _resize(self, new_size):
+        """Move every entry into a new list of new_size buckets.
+        Running time: O(n + b) for n entries and b buckets, but it only
+        happens after the number of entries has doubled or halved, so each
+        set or delete pays O(1) for resizing on average (amortized).
+        In incremental mode this only starts moving entries, see _rehash_step."""
+        if self._old_buckets is not None:
+            # the last rehash didn't finish in time, so finish it now
+            self._rehash_step(len(self._old_buckets))
+        old_buckets = self.buckets
+        if self.incremental:
+            # a list of None is made in C, much faster than new LinkedLists
+            self.buckets = [None] * new_size
+            self._old_buckets = old_buckets
+            self._rehash_index = 0
+            return
+        self._rebuild(new_size)
 
-    def _bucket_index(self, key):
-        """Return the bucket index where the given key would be stored."""
-        # Calculate the given key's hash code and transform into bucket index
-        return hash(key) % len(self.buckets)
+    def _rebuild(self, new_size):
+        """Move every entry into a new list of new_size buckets all at once,
+        even in incremental mode. Only called when not rehashing.
+        Running time: O(n + b) for n entries and b buckets."""
+        old_buckets = self.buckets
+        self.buckets = [LinkedList() for i in range(new_size)]
+        for bucket in old_buckets:
+            for entry in bucket:
+                # keys are already unique, so there's no need to search the bucket
+                self.buckets[self._bucket_index(entry[0], new_size)].append(entry)
+
+    def _rehash_step(self, num_buckets=REHASH_STEP):
+        """Move the entries of the next num_buckets old buckets to the new
+        buckets, creating the new buckets they can move to. Sizes only ever
+        double or halve, so old bucket i moves to new buckets i and i + old
+        size when growing, or to new bucket i mod new size when shrinking.
+        Running time: O(num_buckets) on average, because buckets are short."""
+        old_buckets = self._old_buckets
+        buckets = self.buckets
+        old_size = len(old_buckets)
+        new_size = len(buckets)
+        end = min(self._rehash_index + num_buckets, old_size)
+        for index in range(self._rehash_index, end):
+            if new_size > old_size:
+                buckets[index] = LinkedList()
+                buckets[index + old_size] = LinkedList()
+            elif buckets[index % new_size] is None:
+                buckets[index % new_size] = LinkedList()
+            for entry in old_buckets[index]:
+                buckets[self._bucket_index(entry[0], new_size)].append(entry)
+            # drop the old bucket now, so its nodes can be freed
+            old_buckets[index] = None
+        self._rehash_index = end
+        if end == old_size:
+            self._old_buckets = None
+
+    def _reserve(self, num_entries):
+        """Grow the buckets all at once, if needed, so num_entries entries fit
+        without going over max_load_factor. Only called when not rehashing.
+        The size may grow by more than double, which incremental rehashing
+        can't do, so bulk loads always rebuild eagerly (they're O(n) anyway)."""
+        new_size = len(self.buckets)
+        while num_entries > self.max_load_factor * new_size:
+            new_size *= 2
+        if new_size != len(self.buckets):
+            self._rebuild(new_size)
+
+    def _lookup_all(self, keys, operation):
+        """Return a dict that maps each of the given keys that is in this hash
+        table to its node. Each distinct key is looked up once, with the bucket
+        walk inlined, so there's no method call per key and repeated keys cost
+        one dict lookup. operation names the calling method, for counting
+        probes. Only called when not rehashing."""
+        buckets = self.buckets
+        num_buckets = len(buckets)
+        nodes = {}
+        if self._probes is not None:
+            # count probes per key, with the usual (slower) bucket walk
+            for key in dict.fromkeys(keys):
+                bucket = buckets[self._bucket_index(key, num_buckets)]
+                node = self._find_entry(bucket, key, operation)[1]
+                if node is not None:
+                    nodes[key] = node
+            return nodes
+        # dict.fromkeys drops repeated keys, in C
+        for key in dict.fromkeys(keys):
+            node = buckets[self._bucket_index(key, num_buckets)].head
+            while node is not None:
+                if node.data[0] == key:
+                    nodes[key] = node
+                    break
+                node = node.next
+        return nodes
+
+    def _bucket(self, key):
+        """Return the bucket the given key is stored in, or would be. While
+        rehashing incrementally, each call also moves a few old buckets."""
+        if self._old_buckets is not None:
+            if not self._iterators:
+                self._rehash_step()
+            # the key is still in the old buckets if its bucket hasn't moved
+            if self._old_buckets is not None:
+                index = self._bucket_index(key, len(self._old_buckets))
+                if index >= self._rehash_index:
+                    return self._old_buckets[index]
+        buckets = self.buckets
+        return buckets[self._bucket_index(key, len(buckets))]
+
+    def iter_items(self):
+        """Yield each item (key-value pair) in this hash table, one at a time,
+        without building a list of them. Like a dict, the hash table should
+        not be changed while it is being iterated.
+        Running time: O(n + b) for n entries and b buckets to yield them all,
+        but only O(1) extra memory, and stopping early skips the rest."""
+        self._iterators += 1
+        try:
+            if self._old_buckets is not None:
+                # entries that haven't moved yet
+                for index in range(self._rehash_index, len(self._old_buckets)):
+                    yield from self._old_buckets[index]
+            for bucket in self.buckets:
+                if bucket is not None:
+                    yield from bucket
+        finally:
+            self._iterators -= 1
+
+    def iter_keys(self):
+        """Yield each key in this hash table, one at a time, see iter_items."""
+        for key, value in self.iter_items():
+            yield key
+
+    def iter_values(self):
+        """Yield each value in this hash table, one at a time, see iter_items."""
+        for key, value in self.iter_items():
+            yield value
 
     def keys(self):
         """Return a list of all keys in this hash table.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # Collect all keys in each bucket
-        all_keys = []
-        for bucket in self.buckets:
-            for key, value in bucket.items():
-                all_keys.append(key)
-        return all_keys
+        Running time: O(n + b) for n entries and b buckets, because every
+        bucket is checked and every entry copied into the list."""
+        return list(self.iter_keys())
 
     def values(self):
         """Return a list of all values in this hash table.
-        Running time: O(n) where n is total number of key-value entries,
-    because we need to traverse all buckets and entries.
-"""
-        all_values = []
-         # loop through each bucket
-        for bucket in self.buckets:       
-        # look at each key-value pair in the bucket
-        # ignore the key and add the value to a list
-            for key, value in bucket.items():  
-                all_values.append(value)    
-        return all_values
-
-
-
+        Running time: O(n + b) for n entries and b buckets, same as keys."""
+        return list(self.iter_values())
 
     def items(self):
         """Return a list of all items (key-value pairs) in this hash table.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # Collect all pairs of key-value entries in each bucket
-        all_items = []
-        for bucket in self.buckets:
-            all_items.extend(bucket.items())
-        return all_items
+        Running time: O(n + b) for n entries and b buckets, same as keys."""
+        return list(self.iter_items())
 
     def length(self):
-        """Return the number of key-value entries by traversing its buckets.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        total = 0
-        # count each item in each bucket and return the total
-        for bucket in self.buckets:        
-            for item in bucket.items():     
-                total += 1                  
-        return total
+        """Return the number of key-value entries.
+        Running time: O(1) because set and delete keep count of the entries,
+        so there's no need to traverse the buckets."""
+        return self.size
+
 
+    def _find_entry(self, bucket, key, operation):
+        """Return the node holding the entry with the given key in the given
+        bucket and the node before it, or None for either if there isn't one.
+        Walks the bucket once, without copying it or calling a function per node.
+        operation names the calling method, for _find_entry_counted."""
+        previous = None
+        node = bucket.head
+        while node is not None:
+            if node.data[0] == key:
+                break
+            previous = node
+            node = node.next
+        return previous, node
 
     def contains(self, key):
         """Return True if this hash table contains the given key, or False.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # Find which bucket the key would be in
-        index = self._bucket_index(key)    
-        # Get that bucket
-        bucket = self.buckets[index]       
-        # Look through items in that bucket for the key
-        for bucket_key, value in bucket.items():
-            if bucket_key == key:
-                return True
-        return False
-
+        Running time: O(1) on average, because resizing keeps the load factor
+        (average bucket length) below max_load_factor. O(n) worst case if
+        every key hashes to the same bucket."""
+        bucket = self._bucket(key)
+        return self._find_entry(bucket, key, 'contains')[1] is not None
 
     def get(self, key):
         """Return the value associated with the given key, or raise KeyError.
-        TODO: Running time: O(???) Why and under what conditions?"""
-         # Find bucket
-        index = self._bucket_index(key)   
-        bucket = self.buckets[index]
-        # Look for key in that bucket
-        for bucket_key, value in bucket.items():
-            if bucket_key == key:
-                return value
-        raise KeyError('Key not found: {}'.format(key))
+        Running time: O(1) on average, O(n) worst case, same as contains."""
+        bucket = self._bucket(key)
+        node = self._find_entry(bucket, key, 'get')[1]
+        if node is None:
+            raise KeyError('Key not found: {}'.format(key))
+        return node.data[1]
 
     def set(self, key, value):
         """Insert or update the given key with its associated value.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        index = self._bucket_index(key)    # Find bucket
-        bucket = self.buckets[index]
-        # Look for key in that bucket
-        for i, (bucket_key, val) in enumerate(bucket.items()):
-            if bucket_key == key:          # If found, update value
-                bucket.delete((bucket_key, val))
-                bucket.append((key, value))
-                return
+        Running time: O(1) on average (amortized over resizes), O(n) worst
+        case, same as contains. Walks the key's bucket once."""
+        bucket = self._bucket(key)
+        node = self._find_entry(bucket, key, 'set')[1]
+        if node is not None:
+            # If found, update value in place
+            node.data = (key, value)
+            return
         # If not found, add new pair
         bucket.append((key, value))
+        self.size += 1
+        # Grow if buckets are getting too long on average
+        if self.load_factor() > self.max_load_factor:
+            self._resize(len(self.buckets) * 2)
+
+    def get_many(self, keys):
+        """Return a list of the values associated with the given keys, in the
+        same order, or raise KeyError if any key is missing.
+        Running time: O(m) on average for m keys, but faster than calling get
+        for each, because each distinct key is looked up once (see _lookup_all)."""
+        keys = list(keys)
+        if self._old_buckets is not None:
+            # keep each operation short while rehashing incrementally
+            return [self.get(key) for key in keys]
+        values = {key: node.data[1] for key, node in self._lookup_all(keys, 'get_many').items()}
+        try:
+            return list(map(values.__getitem__, keys))
+        except KeyError as error:
+            raise KeyError('Key not found: {}'.format(error.args[0])) from None
+
+    def contains_many(self, keys):
+        """Return a list of whether this hash table contains each given key,
+        in the same order. Running time: O(m) on average for m keys, see get_many."""
+        keys = list(keys)
+        if self._old_buckets is not None:
+            return [self.contains(key) for key in keys]
+        return list(map(self._lookup_all(keys, 'contains_many').__contains__, keys))
 
+    def update(self, pairs):
+        """Insert or update every (key, value) pair of the given iterable, or
+        every item of a dict or hash table, like calling set on each in order.
+        Existing keys are updated in place, then the buckets are grown once to
+        fit all the new keys, which are appended without having to search
+        their buckets again.
+        Running time: O(m) on average for m pairs, plus one resize at most."""
+        if hasattr(pairs, 'items'):
+            pairs = pairs.items()
+        if self._old_buckets is not None:
+            for key, value in pairs:
+                self.set(key, value)
+            return
+        # last value given for each key, in order of first appearance
+        entries = dict(pairs)
+        nodes = self._lookup_all(entries, 'update')
+        new_entries = []
+        for key, value in entries.items():
+            node = nodes.get(key)
+            if node is not None:
+                # If found, update value in place
+                node.data = (key, value)
+            else:
+                new_entries.append((key, value))
+        self._reserve(self.size + len(new_entries))
+        buckets = self.buckets
+        num_buckets = len(buckets)
+        for entry in new_entries:
+            buckets[self._bucket_index(entry[0], num_buckets)].append(entry)
+        self.size += len(new_entries)
 
+    @classmethod
+    def from_pairs(cls, pairs, expected_size=None, **kwargs):
+        """Return a new hash table of the given (key, value) pairs, or items of
+        a dict or hash table. Its buckets are sized once for expected_size
+        entries if given, otherwise for the number of distinct keys, so it
+        never resizes while loading them. Other keyword arguments are passed
+        to the initializer."""
+        table = cls(**kwargs)
+        if expected_size is not None:
+            table._reserve(expected_size)
+        table.update(pairs)
+        return table
 
     def delete(self, key):
         """Delete the given key from this hash table, or raise KeyError.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        index = self._bucket_index(key)    # Find the bucket
-        bucket = self.buckets[index]
-        
-        # Look for the key in the bucket
-        for item_key, value in bucket.items():
-            if item_key == key:
-                bucket.delete((item_key, value))  # Use our LinkedList delete
-                return
-                
-        # If we get here, key wasn't found
-        raise KeyError('Key not found: {}'.format(key))
+        Running time: O(1) on average (amortized over resizes), O(n) worst
+        case, same as contains. Walks the key's bucket once."""
+        bucket = self._bucket(key)
+        previous, node = self._find_entry(bucket, key, 'delete')
+        if node is None:
+            raise KeyError('Key not found: {}'.format(key))
+        bucket.delete_node(node, previous)
+        self.size -= 1
+        # Shrink if most buckets are empty, but never below the initial size
+        if (self.min_load_factor is not None
+                and self.load_factor() < self.min_load_factor
+                and len(self.buckets) // 2 >= self.init_size):
+            self._resize(len(self.buckets) // 2)
 
 
 def test_hash_table():
@@ -1,7 +1,10 @@
 #!python
 
+import copy
+import gc
 from hashtable import HashTable
 import unittest
+import weakref
 # Python 2 and 3 compatibility: unittest module renamed this assertion method
 if not hasattr(unittest.TestCase, 'assertCountEqual'):
     unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
@@ -44,6 +47,21 @@ class HashTableTest(unittest.TestCase):
         ht.set('X', 10)
         self.assertCountEqual(ht.items(), [('I', 1), ('V', 5), ('X', 10)])
 
+    def test_iterators(self):
+        ht = HashTable()
+        assert list(ht) == []
+        ht.set('I', 1)
+        ht.set('V', 5)
+        ht.set('X', 10)
+        self.assertCountEqual(ht, ['I', 'V', 'X'])  # Iterates over keys
+        assert list(ht.iter_keys()) == ht.keys()
+        assert list(ht.iter_values()) == ht.values()
+        assert list(ht.iter_items()) == ht.items()
+        items = ht.iter_items()
+        assert next(items) in ht.items()  # Lazy, one item at a time
+        assert str(ht) == '{' + ', '.join('{!r}: {!r}'.format(*item) for item in ht.items()) + '}'
+        assert repr(ht) == 'HashTable({!r})'.format(ht.items())
+
     def test_length(self):
         ht = HashTable()
         assert ht.length() == 0
@@ -54,6 +72,22 @@ class HashTableTest(unittest.TestCase):
         ht.set('X', 10)
         assert ht.length() == 3
 
+    def test_len(self):
+        ht = HashTable()
+        assert len(ht) == 0
+        ht.set('I', 1)
+        ht.set('V', 5)
+        ht.set('V', 4)  # Updating a key should not change length
+        assert len(ht) == 2
+        with self.assertRaises(KeyError):
+            ht.delete('X')  # Failed delete should not change length
+        ht.delete('I')
+        assert len(ht) == 1
+        for i in range(100):  # Length survives resizing
+            ht.set(i, i)
+        assert len(ht) == 101
+        assert len(ht) == len(ht.items())
+
     def test_contains(self):
         ht = HashTable()
         ht.set('I', 1)
@@ -103,6 +137,230 @@ class HashTableTest(unittest.TestCase):
         with self.assertRaises(KeyError):
             ht.delete('A')  # Key does not exist
 
+    def test_update(self):
+        ht = HashTable()
+        ht.set('I', 1)
+        ht.update([('V', 4), ('I', 2), ('X', 10), ('V', 5)])
+        assert ht.length() == 3
+        self.assertCountEqual(ht.items(), [('I', 2), ('V', 5), ('X', 10)])
+        ht.update({'L': 50, 'X': 9})  # Items of a dict
+        assert ht.get('X') == 9
+        assert ht.length() == 4
+        ht.update(iter([]))
+        assert ht.length() == 4
+        ht.update((i, i) for i in range(100))  # Grows once to fit
+        assert ht.load_factor() <= 0.75
+        assert ht.get(99) == 99
+
+    def test_from_pairs(self):
+        ht = HashTable.from_pairs([('I', 1), ('V', 5), ('I', 2)])
+        self.assertCountEqual(ht.items(), [('I', 2), ('V', 5)])
+        ht = HashTable.from_pairs(((i, i) for i in range(100)), init_size=4)
+        assert len(ht.buckets) == 256  # Sized for the 100 keys
+        assert ht.get(42) == 42
+        ht = HashTable.from_pairs([('I', 1)], expected_size=1000)
+        assert len(ht.buckets) == 2048  # Sized for 1000 keys
+        assert ht.length() == 1
+
+    def test_get_many_and_contains_many(self):
+        ht = HashTable.from_pairs([('I', 1), ('V', 5), ('X', 10)])
+        assert ht.get_many(['X', 'I', 'X', 'V']) == [10, 1, 10, 5]
+        assert ht.get_many([]) == []
+        assert ht.contains_many(['I', 'A', 'X', 'A']) == [True, False, True, False]
+        with self.assertRaises(KeyError):
+            ht.get_many(['I', 'A'])  # Key does not exist
+
+    def test_bulk_operations_while_rehashing(self):
+        ht = HashTable(8, incremental=True)
+        ht.update((i, i) for i in range(6))
+        ht.set(6, 6)  # Starts rehashing into 16 buckets
+        assert ht._old_buckets is not None
+        ht.update([(0, 10), (7, 7)])
+        assert ht.get_many(range(8)) == [10, 1, 2, 3, 4, 5, 6, 7]
+        assert ht.contains_many([7, 8]) == [True, False]
+
+    def test_bulk_load_incremental(self):
+        for power_of_two in (False, True):
+            # Bulk loads can grow an idle table by more than double at once
+            ht = HashTable(incremental=True, power_of_two=power_of_two)
+            ht.update((i, i) for i in range(100))
+            assert len(ht.buckets) == 256  # 8 doubled to fit 100 keys
+            assert ht.length() == 100
+            assert ht.get_many(range(100)) == list(range(100))
+            ht = HashTable.from_pairs([(str(i), i) for i in range(10)], expected_size=1000,
+                                      incremental=True, power_of_two=power_of_two)
+            assert len(ht.buckets) == 2048
+            assert ht.length() == 10
+            assert ht.contains_many(str(i) for i in range(11)) == [True] * 10 + [False]
+            # Later sets still rehash incrementally
+            for i in range(10, 2000):
+                ht.set(str(i), i)
+            assert ht.length() == 2000
+            for i in range(2000):
+                assert ht.get(str(i)) == i
+
+    def test_no_reference_cycle(self):
+        # Tables free as soon as they're unused, without the cycle collector
+        gc.disable()
+        try:
+            for kwargs in ({}, {'power_of_two': True}, {'hash_function': len},
+                           {'track_probes': True}):
+                ht = HashTable(**kwargs)
+                ht.set('I', 1)
+                table_ref = weakref.ref(ht)
+                del ht
+                assert table_ref() is None
+        finally:
+            gc.enable()
+
+    def test_copy(self):
+        ht = HashTable(power_of_two=True, track_probes=True)
+        ht.set('I', 1)
+        copied = copy.deepcopy(ht)
+        copied.set('V', 5)
+        copied.get('V')
+        # The copy counts its own probes and stores into its own buckets
+        assert ht.contains('V') is False
+        assert 'get' not in ht.stats()['operations']
+        assert copied.stats()['operations']['get'] == 1
+
+    def test_hash_function(self):
+        # Every key of the same length goes in the same bucket
+        ht = HashTable(hash_function=len)
+        for key in ['I', 'V', 'X', 'IV', 'VI', 'IX']:
+            ht.set(key, len(key))
+        assert ht.get('IX') == 2
+        assert ht._bucket_index('IX', len(ht.buckets)) == 2
+        stats = ht.stats()
+        assert stats['max_chain'] == 3
+        assert stats['chain_lengths'] == {0: 6, 3: 2}
+        ht.delete('V')
+        assert ht.contains('V') is False
+        assert ht.length() == 5
+
+    def test_power_of_two(self):
+        ht = HashTable(5, power_of_two=True, min_load_factor=0.1)
+        assert len(ht.buckets) == 8  # Rounded up to a power of two
+        for i in range(100):
+            ht.set(i, i)
+        assert ht._bucket_index(300, len(ht.buckets)) == 300 & 255
+        for i in range(100):
+            assert ht.get(i) == i
+        for i in range(100):
+            ht.delete(i)
+        assert len(ht.buckets) == 8
+
+    def test_stats(self):
+        ht = HashTable(4)
+        assert ht.stats() == {'entries': 0, 'buckets': 4, 'load_factor': 0.0,
+                              'max_chain': 0, 'empty_buckets': 4,
+                              'chain_lengths': {0: 4}}
+        ht = HashTable(4, max_load_factor=2, hash_function=lambda key: key, track_probes=True)
+        for key in [0, 4, 8, 1]:
+            ht.set(key, key)
+        stats = ht.stats()
+        assert stats['max_chain'] == 3
+        assert stats['chain_lengths'] == {0: 2, 1: 1, 3: 1}
+        assert stats['load_factor'] == 1
+        ht.get(8)  # Compares 0, 4, 8
+        ht.contains(12)  # Compares 0, 4, 8
+        ht.set(1, 10)  # Compares 1
+        ht.delete(4)  # Compares 0, 4
+        stats = ht.stats()
+        assert stats['operations'] == {'set': 5, 'get': 1, 'contains': 1, 'delete': 1}
+        assert stats['average_probes'] == {'set': 4 / 5, 'get': 3, 'contains': 3, 'delete': 2}
+        # Bulk operations count one call per distinct key they look up
+        ht.get_many([8, 8, 1])  # Compares 0, 8 then 1
+        ht.contains_many([12])  # Compares 0, 8
+        ht.update([(5, 5)])  # Compares 1
+        stats = ht.stats()
+        assert stats['operations']['get_many'] == 2
+        assert stats['average_probes']['get_many'] == 3 / 2
+        assert stats['average_probes']['contains_many'] == 2
+        assert stats['average_probes']['update'] == 1
+        # Untracked tables don't count anything
+        assert 'operations' not in HashTable().stats()
+
+    def test_resize_grows(self):
+        ht = HashTable(4)
+        for i in range(100):
+            ht.set(i, i * i)
+            assert ht.load_factor() <= 0.75
+        assert len(ht.buckets) == 256  # Doubled from 4 until 100 / 256 <= 0.75
+        assert ht.length() == 100
+        for i in range(100):
+            assert ht.get(i) == i * i
+
+    def test_resize_thresholds(self):
+        ht = HashTable(4, max_load_factor=2)
+        for i in range(8):
+            ht.set(i, i)
+        assert len(ht.buckets) == 4  # Exactly at the max load factor
+        ht.set(8, 8)
+        assert len(ht.buckets) == 8
+        with self.assertRaises(ValueError):
+            HashTable(4, max_load_factor=1, min_load_factor=0.5)
+
+    def test_resize_shrinks(self):
+        ht = HashTable(4, min_load_factor=0.1)
+        for i in range(100):
+            ht.set(i, i)
+        assert len(ht.buckets) == 256
+        for i in range(99):
+            ht.delete(i)
+        assert len(ht.buckets) == 8  # Load factor 1 / 8 is above 0.1
+        assert ht.items() == [(99, 99)]
+        ht.delete(99)
+        assert len(ht.buckets) == 4  # Never shrinks below the initial size
+        # Without a min_load_factor the table never shrinks
+        ht = HashTable(4)
+        for i in range(100):
+            ht.set(i, i)
+        for i in range(100):
+            ht.delete(i)
+        assert len(ht.buckets) == 256
+
+    def test_incremental_rehash(self):
+        ht = HashTable(4, min_load_factor=0.1, incremental=True)
+        for i in range(100):
+            ht.set(i, i * i)
+            # every entry can be found in the middle of rehashing
+            for j in range(0, i + 1, 7):
+                assert ht.get(j) == j * j
+            assert ht.length() == i + 1
+        self.assertCountEqual(ht.keys(), range(100))
+        assert len(ht.buckets) == 256
+        # the same operations are used while shrinking
+        for i in range(90):
+            ht.delete(i)
+            assert ht.contains(i) is False
+            assert ht.contains(i + 1) is True
+        self.assertCountEqual(ht.items(), [(i, i * i) for i in range(90, 100)])
+        while ht._old_buckets is not None:
+            ht.get(99)  # Finish rehashing
+        assert None not in ht.buckets
+        assert len(ht.buckets) < 256
+
+    def test_incremental_rehash_steps(self):
+        ht = HashTable(8, incremental=True)
+        for i in range(7):
+            ht.set(i, i)
+        # the 7th entry started a rehash into 16 buckets, which moves a few
+        # old buckets per operation, not all of them at once
+        assert len(ht.buckets) == 16
+        assert ht._old_buckets is not None
+        ht.get(0)
+        assert ht._rehash_index == 4
+        # iterating pauses rehashing, so every entry is seen once
+        keys = []
+        for key in ht:
+            keys.append(key)
+            ht.get(key)
+        assert ht._rehash_index == 4
+        self.assertCountEqual(keys, range(7))
+        ht.get(0)
+        assert ht._old_buckets is None
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,45 @@
+#!python
+
+from histogram import count_words, frequency, histogram, top_k
+import os
+import tempfile
+import unittest
+
+
+class HistogramTest(unittest.TestCase):
+
+    text = 'The cat sat in the hat\nthe END\n  of the   story\n'
+
+    def setUp(self):
+        file, self.path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(file, 'w') as file:
+            file.write(self.text)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_histogram(self):
+        expected = sorted(count_words(self.text).items())
+        assert histogram(self.text) == expected
+        assert histogram(self.path) == expected
+        assert histogram(self.text.split()) == expected
+        assert frequency('THE', histogram(self.path)) == 4
+        assert frequency('dog', histogram(self.path)) == 0
+
+    def test_chunks(self):
+        # Words cut in half by every chunk size are counted whole
+        expected = count_words(self.text)
+        for chunk_size in range(1, len(self.text) + 2):
+            assert count_words(self.path, chunk_size) == expected
+        assert expected.tokens == 11
+        assert expected.types == 8
+
+    def test_top_k(self):
+        assert top_k(2, self.path) == [('the', 4), ('cat', 1)]
+        assert top_k(1, self.text.split()) == [('the', 4)]
+        assert len(top_k(100, self.text)) == 8
+        assert top_k(0, self.text) == []
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,10 @@
 
 class Node(object):
 # create Node objects, each one holds data (the values) and a reference (pointer to the next node)
+    # fixed attributes instead of a per-node __dict__, which saves memory in
+    # long lists and in every hash table bucket
+    __slots__ = ('data', 'next')
+
     def __init__(self, data):
         """Initialize this node with the given data."""
         self.data = data
@@ -15,10 +19,13 @@ class Node(object):
 
 class LinkedList:
 
+    __slots__ = ('head', 'tail', 'size')
+
     def __init__(self, items=None):
         """Initialize this linked list and append the given items, if any."""
         self.head = None  # First node
         self.tail = None  # Last node
+        self.size = 0  # Number of nodes, kept up to date by append, prepend and delete
         # Append given items
         if items is not None:
             for item in items:
@@ -26,10 +33,31 @@ class LinkedList:
 
     def __repr__(self):
         """Return a string representation of this linked list."""
-        ll_str = ""
-        for item in self.items():
-            ll_str += f'({item}) -> '
-        return ll_str
+        return ''.join(f'({item}) -> ' for item in self)
+
+    def __len__(self):
+        """Return the length of this linked list, so len(ll) works.
+        Running time: O(1) because the number of nodes is tracked."""
+        return self.size
+
+    def __iter__(self):
+        """Yield each item in this linked list, from head to tail, without
+        building a list, so callers can stop early.
+        Running time: O(n) to yield all n items, O(1) for each one."""
+        node = self.head
+        while node is not None:
+            yield node.data
+            node = node.next
+
+    def __contains__(self, item):
+        """Return True if this linked list contains the given item, so
+        `item in ll` works. Running time: O(n) worst case, stops at the first match."""
+        node = self.head
+        while node is not None:
+            if node.data == item:
+                return True
+            node = node.next
+        return False
 
     def items(self):
         """Return a list (dynamic array) of all items in this linked list.
@@ -51,15 +79,10 @@ class LinkedList:
         return self.head is None
 
     def length(self):
-        """Return the length of this linked list by traversing its nodes.
-       Running time: O(n) where n is the number of nodes in the linked list
-    because we must traverse through each node once to count it."""
-        count = 0
-        current = self.head
-        while current is not None:
-            count += 1
-            current = current.next
-        return count
+        """Return the length of this linked list.
+        Running time: O(1) because append, prepend and delete keep count of
+        the nodes, so there's no need to traverse them."""
+        return self.size
 
 
     def append(self, item):
@@ -76,6 +99,7 @@ class LinkedList:
             # add new node after tail
             self.tail.next = new_node
             self.tail = new_node
+        self.size += 1
 
 
     def prepend(self, item):
@@ -92,58 +116,85 @@ class LinkedList:
             # Add new node before head
             new_node.next = self.head
             self.head = new_node
-
+        self.size += 1
+
+
+    def find_node(self, matcher):
+        """Return the first node whose data matcher(data) returns True for,
+        or None if there isn't one. Callers can read or update node.data in
+        place, without copying the list or walking it again.
+        Running time: O(1) best case when the head matches, O(n) worst case
+        when the tail matches or no node does."""
+        node = self.head
+        while node is not None:
+            if matcher(node.data):
+                return node
+            node = node.next
+        return None
 
     def find(self, matcher):
-        """Return an item from this linked list if it is present.
+        """Return the first item in this linked list that matcher(item)
+        returns True for, or None if there isn't one.
         Running time: 
     Best case: O(1) when the item is at the head
     Worst case: O(n) when:
     1. Item is at the tail
     2. Item isn't in the list at all
     3. We have to check every node to find it"""
+        node = self.find_node(matcher)
+        return node.data if node is not None else None
+
+    def replace(self, old_item, new_item):
+        """Replace the first occurrence of old_item with new_item, in place.
+        Does nothing if old_item is not in this linked list.
+        Running time: O(n) worst case, one traversal to find old_item."""
+        node = self.find_node(lambda item: item == old_item)
+        if node is not None:
+            node.data = new_item
+
+    def delete_node(self, node, previous=None):
+        """Unlink the given node from this linked list, where previous is the
+        node before it (None if node is the head), as found while traversing.
+        Running time: O(1) because the neighbours are already known."""
+        # Update head/tail if needed
+        if previous is None:  # Deleting head
+            self.head = node.next
+        else:  # Deleting non-head node
+            previous.next = node.next
 
-        current = self.head       # O(1) - start at head
-    
-        while current is not None:  # Loop through all nodes
-            if current.data == matcher:  # O(1) - check if current node matches
-                return True
-            current = current.next      # O(1) - move to next node
-        
-        return False  # Item not found after checking all nodes
-
-
-
-    def delete(self, item):
-        """Delete the given item from this linked list, or raise ValueError.
-        Running time: O(n) because we might need to traverse the whole list.
-    Under what conditions: Best case O(1) if item is at head, worst case O(n) 
-    if item is at tail or not found.
-"""
+        # Update tail if needed
+        if node.next is None:  # If we're deleting the tail
+            self.tail = previous
+        self.size -= 1
+
+    def delete_where(self, matcher):
+        """Delete the first item that matcher(item) returns True for and
+        return it, or raise ValueError if there isn't one.
+        Running time: O(1) best case if the head matches, O(n) worst case,
+        and it only traverses the list once because it keeps track of the
+        node before the current one, which is needed to unlink it."""
         current = self.head
         previous = None
-        found = False
 
         # Find the node to delete
         while current is not None:
-            if current.data == item:
-                found = True
-                break
+            if matcher(current.data):
+                self.delete_node(current, previous)
+                return current.data
             previous = current
             current = current.next
+        raise ValueError('No item matches: {}'.format(matcher))
 
-        if not found:
-            raise ValueError('Item not found: {}'.format(item))
-
-        # Update head/tail if needed
-        if previous is None:  # Deleting head
-            self.head = current.next
-        else:  # Deleting non-head node
-            previous.next = current.next
-
-        # Update tail if needed
-        if current.next is None:  # If we're deleting the tail
-            self.tail = previous
+    def delete(self, item):
+        """Delete the given item from this linked list, or raise ValueError.
+        Running time: O(n) because we might need to traverse the whole list.
+    Under what conditions: Best case O(1) if item is at head, worst case O(n) 
+    if item is at tail or not found.
+"""
+        try:
+            self.delete_where(lambda data: data == item)
+        except ValueError:
+            raise ValueError('Item not found: {}'.format(item)) from None
 
 
 
@@ -33,6 +33,14 @@ class LinkedListTest(unittest.TestCase):
         assert ll.head is None  # First node
         assert ll.tail is None  # Last node
 
+    def test_slots(self):
+        ll = LinkedList(['A'])
+        # Slotted classes have no per-instance __dict__
+        assert not hasattr(ll, '__dict__')
+        assert not hasattr(ll.head, '__dict__')
+        with self.assertRaises(AttributeError):
+            ll.head.prev = None
+
     def test_init_with_list(self):
         ll = LinkedList(['A', 'B', 'C'])
         # Initializer should append items in order
@@ -111,6 +119,37 @@ class LinkedListTest(unittest.TestCase):
         ll.delete('B')
         assert ll.length() == 0
 
+    def test_iter(self):
+        ll = LinkedList()
+        assert list(ll) == []
+        ll = LinkedList(['A', 'B', 'C'])
+        assert list(ll) == ['A', 'B', 'C']
+        items = iter(ll)
+        assert next(items) == 'A'  # Lazy, one item at a time
+        assert next(items) == 'B'
+
+    def test_contains(self):
+        ll = LinkedList(['A', 'B', 'C'])
+        assert 'A' in ll
+        assert 'C' in ll
+        assert 'X' not in ll
+        ll.delete('C')
+        assert 'C' not in ll
+
+    def test_len(self):
+        ll = LinkedList()
+        assert len(ll) == 0
+        ll.append('B')
+        ll.prepend('A')
+        ll.append('C')
+        assert len(ll) == 3
+        with self.assertRaises(ValueError):
+            ll.delete('X')  # Failed delete should not change length
+        assert len(ll) == 3
+        ll.delete('B')
+        assert len(ll) == 2
+        assert len(ll) == len(ll.items())
+
     def test_append(self):
         ll = LinkedList()
         # Append should always update tail node
@@ -144,6 +183,35 @@ class LinkedListTest(unittest.TestCase):
         assert ll.find(lambda item: item > 'B') == 'C'  # Match greater than
         assert ll.find(lambda item: item == 'X') is None  # No matching item
 
+    def test_find_node(self):
+        ll = LinkedList(['A', 'B', 'C'])
+        node = ll.find_node(lambda item: item > 'A')
+        assert node is ll.head.next  # First match, not a copy
+        node.data = 'X'  # Update in place
+        assert ll.items() == ['A', 'X', 'C']
+        assert ll.find_node(lambda item: item == 'B') is None
+
+    def test_delete_where(self):
+        ll = LinkedList([('A', 1), ('B', 2), ('C', 3)])
+        assert ll.delete_where(lambda item: item[0] == 'C') == ('C', 3)
+        assert ll.tail.data == ('B', 2)  # New tail
+        assert ll.delete_where(lambda item: item[1] < 3) == ('A', 1)
+        assert ll.head.data == ('B', 2)  # New head
+        assert ll.length() == 1
+        with self.assertRaises(ValueError):
+            ll.delete_where(lambda item: item[0] == 'X')  # No matching item
+        assert ll.length() == 1
+
+    def test_delete_node(self):
+        ll = LinkedList(['A', 'B', 'C'])
+        ll.delete_node(ll.tail, ll.head.next)
+        assert ll.items() == ['A', 'B']
+        assert ll.tail.data == 'B'  # New tail
+        ll.delete_node(ll.head)
+        assert ll.items() == ['B']
+        assert ll.head is ll.tail
+        assert ll.length() == 1
+
     def test_delete_with_3_items(self):
         ll = LinkedList(['A', 'B', 'C'])
         assert ll.head.data == 'A'  # First item
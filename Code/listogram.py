@@ -1,20 +1,31 @@
 #!python
 
 from __future__ import division, print_function  # Python 2 and 3 compatibility
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
 import random
 
 
 class Listogram(list):
     """Listogram is a histogram implemented as a subclass of the list type."""
 
-    def __init__(self, word_list=None):
-        """Initialize this histogram as a new list and count given words."""
+    def __init__(self, word_list=None, indexed=False):
+        """Initialize this histogram as a new list and count given words.
+        If indexed is True, a side dict maps each word to the index of its
+        entry, so index_of, add_count, frequency and `in` are O(1) instead
+        of a linear search. Entries stay in the same order either way.
+        Appending or replacing one entry updates the index in O(1); every
+        other list method that moves entries (insert, extend, pop, remove,
+        del, sort, slice assignment...) rebuilds it in O(n). Only add_count
+        and merge keep types and tokens up to date."""
         # self in this class will be a list of tuples
         super(Listogram, self).__init__() 
         # count of distinct word types in this histogram
         self.types = 0  
         # total count of all words in this histogram
         self.tokens = 0  
+        # index of each word's entry, or None if not indexed
+        self._indexes = {} if indexed else None
         # increase frequency of unique words using add_count method
         if word_list is not None:
             for word in word_list:
@@ -27,9 +38,10 @@ class Listogram(list):
         index = self.index_of(word)
         
         if index is not None:
-            # word exists, update count in the tuple
+            # word exists, update count in the tuple. The word stays at the
+            # same index, so list's own method skips updating the index
             word_count = self[index][1]
-            self[index] = (word, word_count + count)
+            list.__setitem__(self, index, (word, word_count + count))
         else:
             # word doesn't exist, add new entry
             self.append((word, count))
@@ -38,6 +50,96 @@ class Listogram(list):
         self.tokens += count
 
 
+    def append(self, entry):
+        """Append the given (word, count) entry, recording its index if this
+        histogram is indexed."""
+        if self._indexes is not None:
+            self._indexes[entry[0]] = len(self)
+        super(Listogram, self).append(entry)
+
+    def __setitem__(self, index, entry):
+        """Replace the entry at the given index (or entries in a slice),
+        keeping the index up to date if this histogram is indexed.
+        Running time: O(1) for one entry, O(n) for a slice."""
+        if self._indexes is None:
+            super(Listogram, self).__setitem__(index, entry)
+        elif isinstance(index, slice):
+            super(Listogram, self).__setitem__(index, entry)
+            self._reindex()
+        else:
+            if index < 0:
+                index += len(self)
+            old_word = self[index][0]
+            super(Listogram, self).__setitem__(index, entry)
+            # forget the replaced word, unless it has already moved elsewhere
+            if old_word != entry[0] and self._indexes.get(old_word) == index:
+                del self._indexes[old_word]
+            self._indexes[entry[0]] = index
+
+    def _reindex(self):
+        """Rebuild the index of each word's entry, if this histogram is
+        indexed, after entries were added, removed or moved.
+        Running time: O(n) for n word types."""
+        if self._indexes is not None:
+            self._indexes = {entry[0]: index for index, entry in enumerate(self)}
+
+    # list methods that move entries, each followed by rebuilding the index
+
+    def __delitem__(self, index):
+        super(Listogram, self).__delitem__(index)
+        self._reindex()
+
+    def __iadd__(self, entries):
+        result = super(Listogram, self).__iadd__(entries)
+        self._reindex()
+        return result
+
+    def __imul__(self, times):
+        result = super(Listogram, self).__imul__(times)
+        self._reindex()
+        return result
+
+    def clear(self):
+        super(Listogram, self).clear()
+        self._reindex()
+
+    def extend(self, entries):
+        super(Listogram, self).extend(entries)
+        self._reindex()
+
+    def insert(self, index, entry):
+        super(Listogram, self).insert(index, entry)
+        self._reindex()
+
+    def pop(self, index=-1):
+        entry = super(Listogram, self).pop(index)
+        self._reindex()
+        return entry
+
+    def remove(self, entry):
+        super(Listogram, self).remove(entry)
+        self._reindex()
+
+    def reverse(self):
+        super(Listogram, self).reverse()
+        self._reindex()
+
+    def sort(self, *args, **kwargs):
+        super(Listogram, self).sort(*args, **kwargs)
+        self._reindex()
+
+    def merge(self, other):
+        """Add the counts of another histogram (a Listogram, a Dictogram or any
+        iterable of (word, count) pairs) into this histogram. Words new to
+        this histogram are appended in the order they appear in the other one.
+        Running time: O(n * m) for m word types in the other histogram,
+        because each one is found with a linear search of n types, or O(m)
+        if this histogram is indexed."""
+        pairs = other.items() if isinstance(other, dict) else other
+        for word, count in pairs:
+            self.add_count(word, count)
+
+
     def frequency(self, word):
         """Return frequency count of given word, or 0 if word is not found."""
         # TODO: Retrieve word frequency count
@@ -56,7 +158,10 @@ class Listogram(list):
 
     def index_of(self, target):
         """Return the index of entry containing given target word if found in
-        this histogram, or None if target word is not found."""
+        this histogram, or None if target word is not found.
+        Running time: O(1) if indexed, otherwise O(n) for n word types."""
+        if self._indexes is not None:
+            return self._indexes.get(target)
         # TODO: Implement linear search to find index of entry with target word
          # Linear search through list of tuples
         # self is a list of tuples
@@ -86,6 +191,168 @@ class Listogram(list):
             if random_value <= cumulative:
                 return word
 
+    def expected_probes(self):
+        """Return the expected number of entries sample() checks to draw one
+        word. The entry at position i (counting from 1) is reached after
+        checking i entries, and is drawn with probability count / tokens,
+        so entries with large counts near the front make sampling fast."""
+        if self.tokens == 0:
+            return 0
+        total = 0
+        for position, (word, count) in enumerate(self, 1):
+            total += position * count
+        return total / self.tokens
+
+    def sample_many(self, k, rng=None):
+        """Return a list of k words from this histogram, each randomly sampled
+        by weighting its probability of being chosen by its frequency.
+        Pass a random.Random instance as rng for reproducible samples.
+        Raises ValueError if this histogram is empty and k is positive.
+        Running time: O(n + k log n) for n word types, because we total the
+        counts once and then every draw binary searches those totals."""
+        if not self:
+            # random.choices can't draw from nothing, even zero times
+            if k > 0:
+                raise ValueError('Cannot sample from an empty histogram')
+            return []
+        if rng is None:
+            rng = random
+        words = []
+        cumulative = []
+        total = 0
+        for word, count in self:
+            total += count
+            words.append(word)
+            cumulative.append(total)
+        return rng.choices(words, cum_weights=cumulative, k=k)
+
+
+class SortedListogram(Listogram):
+    """SortedListogram is a Listogram that keeps its entries sorted by word,
+    like histogram.histogram returns them, so a word is found by binary
+    search and two sorted listograms merge in one pass."""
+
+    def __init__(self, word_list=None):
+        """Initialize this histogram as a new list and count given words.
+        Words are found by binary search, so there's no index dict to keep."""
+        super(SortedListogram, self).__init__(word_list)
+
+    def index_of(self, target):
+        """Return the index of entry containing given target word if found in
+        this histogram, or None if target word is not found.
+        Running time: O(log n) for n word types, by binary search."""
+        index = bisect_left(self, target, key=itemgetter(0))
+        if index < len(self) and self[index][0] == target:
+            return index
+        return None
+
+    def add_count(self, word, count=1):
+        """Increase frequency count of given word by given count amount,
+        inserting a new word where it keeps the entries sorted.
+        Running time: O(log n) to find the word, plus O(n) to insert a new
+        one, but that is a single memory move done in C."""
+        index = bisect_left(self, word, key=itemgetter(0))
+        if index < len(self) and self[index][0] == word:
+            # word exists, update count in the tuple, see Listogram.add_count
+            list.__setitem__(self, index, (word, self[index][1] + count))
+        else:
+            # word doesn't exist, insert new entry in sorted position.
+            # Sorted listograms have no index dict, so use list's own insert
+            list.insert(self, index, (word, count))
+            self.types += 1
+        self.tokens += count
+
+    def merge(self, other):
+        """Add the counts of another histogram into this histogram. If the
+        other histogram is sorted too (such as the histograms of separate
+        chapters), both lists are walked together like the merge step of
+        merge sort. Running time: O(n + m) for n and m word types if other is
+        a SortedListogram, otherwise O(m log n) plus inserts."""
+        if not isinstance(other, SortedListogram):
+            super(SortedListogram, self).merge(other)
+            return
+        merged = []
+        i = j = 0
+        while i < len(self) and j < len(other):
+            word, count = self[i]
+            other_word, other_count = other[j]
+            if word < other_word:
+                merged.append(self[i])
+                i += 1
+            elif other_word < word:
+                merged.append(other[j])
+                j += 1
+            else:
+                merged.append((word, count + other_count))
+                i += 1
+                j += 1
+        # one of the lists is used up, the rest of the other one comes after
+        merged.extend(self[i:])
+        merged.extend(other[j:])
+        self[:] = merged
+        self.types = len(merged)
+        self.tokens += other.tokens
+
+
+def _negative_count(entry):
+    """Return minus the count of the given entry, which increases along the
+    entries of a FrequencyListogram, as bisect needs."""
+    return -entry[1]
+
+
+class FrequencyListogram(Listogram):
+    """FrequencyListogram is a Listogram that keeps its entries in descending
+    order of count, moving a word toward the front as its count grows (a
+    self-organizing list). Word counts in natural language are Zipfian, a
+    few words make up most of the text, so sample() and the linear search
+    in index_of usually stop after checking only a few entries."""
+
+    def add_count(self, word, count=1):
+        """Increase frequency count of given word by given count amount, then
+        move its entry in front of every entry with a smaller count.
+        Running time: O(i) for a word at index i to find it, or O(1) if
+        indexed, plus O(log i) to find where it moves."""
+        index = self.index_of(word)
+        if index is not None:
+            # word exists, update count in the tuple, see Listogram.add_count
+            list.__setitem__(self, index, (word, self[index][1] + count))
+        else:
+            # word doesn't exist, add new entry
+            self.append((word, count))
+            self.types += 1
+            index = len(self) - 1
+        self.tokens += count
+        self._move_forward(index)
+
+    def _move_forward(self, index):
+        """Move the entry at the given index, whose count has grown, in front
+        of all entries with a smaller count, after those with the same count.
+        Entries with the same count don't keep any particular order: when
+        every entry it passes has the same count, it swaps places with the
+        first of them, which moves that one to the back of the tie. Keeping
+        ties in order would mean shifting (and reindexing) all of them."""
+        entry = self[index]
+        target = bisect_right(self, -entry[1], hi=index, key=_negative_count)
+        if target == index:
+            return
+        if self[target][1] == self[index - 1][1]:
+            # every entry it passes has the same count (always the case when
+            # adding 1), so swapping with the first of them keeps the counts
+            # in order in O(1), though that entry moves behind its ties
+            list.__setitem__(self, index, self[target])
+            list.__setitem__(self, target, entry)
+            moved = (target, index)
+        else:
+            # shift the entries it passes back by one, a memory move in C
+            list.__delitem__(self, index)
+            list.insert(self, target, entry)
+            moved = range(target, index + 1)
+        # list's own methods above skip rebuilding the whole index, only the
+        # entries that moved need updating
+        if self._indexes is not None:
+            for position in moved:
+                self._indexes[self[position][0]] = position
+
 
 def print_histogram(word_list):
     print()
@@ -105,7 +372,7 @@ def print_histogram(word_list):
 def print_histogram_samples(histogram):
     print('Histogram samples:')
     # Sample the histogram 10,000 times and count frequency of results
-    samples_list = [histogram.sample() for _ in range(10000)]
+    samples_list = histogram.sample_many(10000)
     samples_hist = Listogram(samples_list)
     print('samples: {}'.format(samples_hist))
     print()
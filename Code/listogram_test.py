@@ -1,6 +1,7 @@
 #!python
 
-from listogram import Listogram
+from listogram import FrequencyListogram, Listogram, SortedListogram
+import random
 import unittest
 # Python 2 and 3 compatibility: unittest module renamed this assertion method
 if not hasattr(unittest.TestCase, 'assertCountEqual'):
@@ -86,6 +87,128 @@ class ListogramTest(unittest.TestCase):
             histogram.add_count(word)
         assert histogram.types == 5
 
+    def test_merge(self):
+        histogram = Listogram(self.fish_words[:4])
+        other = Listogram(self.fish_words[4:])
+        # Merging should add counts as if all words were counted together
+        histogram.merge(other)
+        assert list(histogram) == self.fish_list
+        assert histogram.types == 5
+        assert histogram.tokens == 8
+        # Merging (word, count) pairs should work too
+        histogram.merge([('fish', 2), ('food', 1)])
+        assert histogram.frequency('fish') == 6
+        assert histogram.frequency('food') == 1
+        assert histogram.types == 6
+        assert histogram.tokens == 11
+
+    def test_indexed(self):
+        histogram = Listogram(self.fish_words, indexed=True)
+        # Same entries in the same order as without the index
+        assert histogram == Listogram(self.fish_words)
+        assert histogram.index_of('fish') == 1
+        assert histogram.index_of('food') is None
+        histogram.add_count('fish', 2)
+        histogram.add_count('food', 5)
+        assert histogram.frequency('fish') == 6
+        assert histogram.index_of('food') == 5
+        assert 'food' in histogram
+        assert 'fishy' not in histogram
+        histogram.merge([('red', 1), ('green', 2)])
+        assert histogram[-1] == ('green', 2)
+        for index, (word, count) in enumerate(histogram):
+            assert histogram.index_of(word) == index
+        assert histogram.types == 7
+        assert histogram.tokens == 18
+
+    def test_indexed_list_methods(self):
+        histogram = Listogram(['a', 'b'], indexed=True)
+        # Every list method that changes entries keeps the index up to date
+        histogram.extend([('c', 1)])
+        histogram.insert(0, ('d', 1))
+        histogram += [('e', 2)]
+        histogram[1] = ('f', 3)  # Replaces 'a'
+        assert 'a' not in histogram
+        histogram.remove(('b', 1))
+        histogram.sort()
+        assert histogram == [('c', 1), ('d', 1), ('e', 2), ('f', 3)]
+        histogram.pop(0)
+        del histogram[-1]
+        histogram.reverse()
+        assert histogram == [('e', 2), ('d', 1)]
+        for word in ['a', 'b', 'c', 'f']:
+            assert word not in histogram
+        for index, (word, count) in enumerate(histogram):
+            assert histogram.index_of(word) == index
+        histogram[:] = [('g', 1)]
+        assert histogram.index_of('g') == 0
+        assert 'e' not in histogram
+        histogram.clear()
+        assert 'g' not in histogram
+
+    def test_sorted(self):
+        histogram = SortedListogram(self.fish_words)
+        assert histogram == sorted(self.fish_list)
+        assert histogram.index_of('fish') == 1
+        assert histogram.index_of('food') is None
+        assert histogram.index_of('zebra') is None  # Past the last entry
+        histogram.add_count('food', 5)
+        histogram.add_count('red', 2)
+        histogram.add_count('apple')
+        assert histogram == sorted(histogram)
+        assert histogram.frequency('red') == 3
+        assert histogram.frequency('food') == 5
+        assert 'apple' in histogram
+        assert 'fishy' not in histogram
+        assert histogram.types == 7
+        assert histogram.tokens == 16
+
+    def test_sorted_merge(self):
+        histogram = SortedListogram(['one', 'fish', 'two', 'fish'])
+        histogram.merge(SortedListogram(['red', 'fish', 'blue', 'fish', 'zebra']))
+        assert histogram == [('blue', 1), ('fish', 4), ('one', 1), ('red', 1),
+                             ('two', 1), ('zebra', 1)]
+        assert histogram.types == 6
+        assert histogram.tokens == 9
+        # Merging any other histogram keeps the entries sorted
+        histogram.merge({'ant': 2, 'fish': 1})
+        histogram.merge(SortedListogram())
+        assert histogram == sorted(histogram)
+        assert histogram.frequency('fish') == 5
+        assert histogram.types == 7
+        assert histogram.tokens == 12
+
+    def test_frequency_ordered(self):
+        histogram = FrequencyListogram(self.fish_words)
+        # Counts are in descending order, ties in no particular order
+        assert histogram == [('fish', 4), ('one', 1), ('two', 1), ('red', 1), ('blue', 1)]
+        histogram.add_count('red')  # Swapped with the first of the 1s
+        assert histogram == [('fish', 4), ('red', 2), ('two', 1), ('one', 1), ('blue', 1)]
+        histogram.add_count('blue', 4)  # Passes entries with different counts
+        assert histogram == [('blue', 5), ('fish', 4), ('red', 2), ('two', 1), ('one', 1)]
+        histogram.add_count('food', 3)
+        assert histogram.index_of('food') == 2
+        assert histogram.frequency('food') == 3
+        assert histogram.types == 6
+        assert histogram.tokens == 16
+
+    def test_frequency_ordered_indexed(self):
+        histogram = FrequencyListogram(self.fish_words, indexed=True)
+        histogram.add_count('red')
+        histogram.add_count('blue', 4)
+        histogram.merge({'food': 3, 'one': 1})
+        counts = [count for word, count in histogram]
+        assert counts == sorted(counts, reverse=True)
+        for index, (word, count) in enumerate(histogram):
+            assert histogram.index_of(word) == index
+
+    def test_expected_probes(self):
+        assert Listogram().expected_probes() == 0
+        # 'one' is checked by all 8 draws, 'fish' by 7, 'two' by 3 and so on
+        assert Listogram(self.fish_words).expected_probes() == (1 + 8 + 3 + 4 + 5) / 8
+        # 'fish' is first, so half the draws stop after checking 1 entry
+        assert FrequencyListogram(self.fish_words).expected_probes() == (4 + 2 + 3 + 4 + 5) / 8
+
     def test_sample(self):
         histogram = Listogram(self.fish_words)
         # Create a list of 10,000 word samples from histogram
@@ -104,6 +227,33 @@ class ListogramTest(unittest.TestCase):
             upper_bound = observed_freq * 1.1  # 10% above = 110% = 1.1
             assert lower_bound <= sampled_freq <= upper_bound
 
+    def test_sample_many(self):
+        histogram = Listogram(self.fish_words)
+        # Draw 10,000 word samples from histogram in one call
+        samples_list = histogram.sample_many(10000)
+        assert len(samples_list) == 10000
+        samples_hist = Listogram(samples_list)
+        # Check each word in original histogram
+        for word, count in histogram:
+            observed_freq = count / histogram.tokens
+            sampled_freq = samples_hist.frequency(word) / samples_hist.tokens
+            assert observed_freq * 0.9 <= sampled_freq <= observed_freq * 1.1
+
+    def test_sample_many_with_rng(self):
+        histogram = Listogram(self.fish_words)
+        # Samples from generators with the same seed should be identical
+        samples1 = histogram.sample_many(100, rng=random.Random(1120))
+        samples2 = histogram.sample_many(100, rng=random.Random(1120))
+        assert samples1 == samples2
+        assert histogram.sample_many(0) == []
+
+    def test_sample_many_empty(self):
+        histogram = Listogram()
+        # Drawing nothing from an empty histogram is fine, drawing words isn't
+        assert histogram.sample_many(0) == []
+        with self.assertRaises(ValueError):
+            histogram.sample_many(1)
+
 
 if __name__ == '__main__':
     unittest.main()
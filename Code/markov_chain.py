@@ -1,61 +1,238 @@
 from dictogram import Dictogram
+from itertools import islice
+from transition_table import TransitionTable
+from vocabulary import Vocabulary
 import random
 
+# punctuation that closes a sentence
+SENTENCE_ENDINGS = (".", "!", "?")
+
+# number of words build_markov_dict reads and counts at a time
+BATCH_SIZE = 64 * 1024
+
+
+def is_capitalized(word):
+    """Return True if word is a string that starts with an uppercase letter."""
+    return isinstance(word, str) and word[:1].isupper()
+
+
+def ends_sentence(word):
+    """Return True if word is a string that ends with closing punctuation."""
+    return isinstance(word, str) and word[-1:] in SENTENCE_ENDINGS
+
+
+def windows(items, size):
+    """Return an iterator over every run of size consecutive items of a list,
+    as tuples, like a window sliding along the list one item at a time."""
+    # size copies of the list, each starting one item further along, zipped
+    # together so the nth tuple holds items n to n + size - 1
+    num_windows = len(items) - size + 1
+    return zip(*[items[k:k + num_windows] for k in range(size)])
+
+
+def starts_sentence(previous_word, word):
+    """Return True if word is capitalized and begins a sentence, either because
+    it opens the text (previous_word is None) or follows closing punctuation."""
+    return is_capitalized(word) and (previous_word is None or ends_sentence(previous_word))
+
+
 class MarkovChain:
-    def __init__(self, word_list):
-        """Initialize a Markov Chain with a list of words."""
+    def __init__(self, word_list, order=1):
+        """Initialize a Markov Chain of the given order with a list of words.
+        Each state of an order k chain is the last k words of the sentence."""
+        if order < 1:
+            raise ValueError('Order must be at least 1: {}'.format(order))
+        self.order = order
+        # words are interned as int ids, so every state is a tuple of order
+        # ids and each distinct word string is stored once, in the vocabulary
+        self.vocab = Vocabulary()
         self.markov_dict = {}
+        # every key of markov_dict, kept in a list so random.choice is O(1)
+        self.states = []
+        # states whose first word is capitalized and begins a sentence in the
+        # corpus, weighted by how many sentences they begin, so a sentence
+        # start is one sample
+        self.start_states = Dictogram()
+        # frozen array-backed copy of the chain, made by compile()
+        self.table = None
+        # whether each word id is capitalized / ends a sentence, see _word_flags
+        self._capitalized = []
+        self._sentence_ends = []
         self.build_markov_dict(word_list)
 
-    def build_markov_dict(self, word_list):
-        """Build a dictionary that maps each word to a Dictogram of its possible next words."""
-        # each word is the key and a dictogram is it's value. the dicto is another nested dict with keys being words that come after 
-        # og word and values being numerical probability of occurrence
-        for i in range(len(word_list) - 1):
-            current_word = word_list[i]
-            next_word = word_list[i + 1]
-            
-            # if we've seen this word before, add the next word to its dictogram
-            # in the nested key value pair
-            if current_word in self.markov_dict:
-                self.markov_dict[current_word].add_count(next_word)
-            # otherwise, create a new dictogram with the next word
+    def build_markov_dict(self, word_list, previous_word=None):
+        """Build a dictionary that maps each state (tuple of order word ids) to a Dictogram of its possible next word ids.
+        word_list can be any iterable of words, such as text_cleaner.iter_clean_words,
+        and is read only once. Calling this again with more words adds them to the existing chain.
+        If word_list continues a text, previous_word is the word before it, so the chain can tell
+        whether the first state begins a sentence."""
+        # each state is the key and a dictogram is it's value. the dicto is another nested dict with keys being ids of words that come after
+        # og state and values being numerical probability of occurrence
+        if self.table is not None:
+            raise ValueError('Cannot add words to a compiled Markov chain')
+        order = self.order
+        # ids of the last order words read, which begin the next batch's first state
+        context = []
+        # whether the word before the context ends a sentence (or there isn't one)
+        after_sentence_end = previous_word is None or ends_sentence(previous_word)
+        words = iter(word_list)
+        while True:
+            batch = list(islice(words, BATCH_SIZE))
+            if not batch:
+                break
+            word_ids = context + self.vocab.intern_all(batch)
+            num_states = len(word_ids) - order
+            # the first order words only fill up the first state
+            if num_states <= 0:
+                context = word_ids
+                continue
+
+            # every (state, next word) transition in the batch as one tuple of
+            # order + 1 ids, counted by Dictogram's fast counting loop
+            transitions = Dictogram.from_iterable(windows(word_ids, order + 1))
+            for window, count in transitions.items():
+                current_state = window[:-1]
+                # if we've seen this state before, add the next word to its dictogram
+                # in the nested key value pair
+                followers = self.markov_dict.get(current_state)
+                # otherwise, create a new dictogram for the next word
+                if followers is None:
+                    followers = self.markov_dict[current_state] = Dictogram()
+                    self.states.append(current_state)
+                followers.add_count(window[-1], count)
+
+            # a state begins a sentence if its first word is capitalized and
+            # the word before it ends a sentence (flags are looked up by id)
+            capitalized, sentence_ends = self._word_flags()
+            # every state that has a next word, so the last order ids are left out
+            for current_state in windows(word_ids[:-1], order):
+                first_id = current_state[0]
+                if after_sentence_end and capitalized[first_id]:
+                    self.start_states.add_count(current_state)
+                after_sentence_end = sentence_ends[first_id]
+
+            context = word_ids[num_states:]
+
+    def _word_flags(self):
+        """Return lists of whether each word id is capitalized and whether it
+        ends a sentence, adding flags for words new to the vocabulary."""
+        words = self.vocab.words
+        for word_id in range(len(self._capitalized), len(words)):
+            self._capitalized.append(is_capitalized(words[word_id]))
+            self._sentence_ends.append(ends_sentence(words[word_id]))
+        return self._capitalized, self._sentence_ends
+
+    @classmethod
+    def from_table(cls, vocab, table):
+        """Return a compiled Markov chain made from a Vocabulary and the
+        TransitionTable of word ids built with it, without any training."""
+        chain = cls([], order=table.order)
+        chain.vocab = vocab
+        chain.table = table
+        return chain
+
+    def merge(self, other):
+        """Add the states, transition counts and start states of another chain
+        of the same order (compiled or not) into this chain. Merging the chains
+        of consecutive parts of a text in order gives exactly the chain of the
+        whole text, as long as each part knows the words around it (see
+        parallel_trainer). Running time: O(n) for n transitions in the other chain."""
+        if other.order != self.order:
+            raise ValueError('Cannot merge chains of order {} and {}'.format(self.order, other.order))
+        if self.table is not None:
+            raise ValueError('Cannot add words to a compiled Markov chain')
+        if other.table is not None:
+            table = other.table
+            transitions = table.iter_rows()
+            start_states = table.start_items()
+        else:
+            transitions = ((state, followers.items()) for state, followers in other.markov_dict.items())
+            start_states = other.start_states.items()
+        # the other chain numbered its words in its own vocabulary, so look up
+        # (or add) each of its words in this vocabulary
+        new_ids = [self.vocab.intern(word) for word in other.vocab.words]
+        markov_dict = self.markov_dict
+        for state, followers in transitions:
+            new_state = tuple([new_ids[word_id] for word_id in state])
+            histogram = markov_dict.get(new_state)
+            if histogram is None:
+                histogram = markov_dict[new_state] = Dictogram()
+                self.states.append(new_state)
+            histogram.merge([(new_ids[word_id], count) for word_id, count in followers])
+        self.start_states.merge(
+            [(tuple([new_ids[word_id] for word_id in state]), count)
+             for state, count in start_states])
+
+    def compile(self):
+        """Freeze this chain into a TransitionTable of flat int arrays and drop
+        the per-state Dictograms, which cuts memory several-fold. Sentences
+        are generated the same way (and identically for the same random seed)
+        but no more words can be added. Returns this chain."""
+        if self.table is None:
+            self.table = TransitionTable(self.markov_dict, self.start_states, self.order)
+            self.markov_dict = {}
+            self.states = []
+            self.start_states = Dictogram()
+        return self
+
+    def followers(self, words):
+        """Return a Dictogram of the words that follow the given order words
+        in the corpus, or an empty Dictogram if they never occur together."""
+        histogram = Dictogram()
+        if not all(word in self.vocab for word in words):
+            return histogram
+        state = self.vocab.encode(words)
+        if self.table is not None:
+            row = self.table.row(state)
+            followers = self.table.items(row) if row is not None else []
+        else:
+            followers = self.markov_dict.get(state, {}).items()
+        for word_id, count in followers:
+            histogram.add_count(self.vocab.words[word_id], count)
+        return histogram
+
+    def _walk(self, num_words):
+        """Return a list of num_words word ids from a random walk of markov_dict."""
+        # start like the corpus does, with a state that begins its sentences
+        if self.start_states:
+            current_state = self.start_states.sample()
+        # otherwise any of the states in the corpus will do
+        else:
+            current_state = random.choice(self.states)
+
+        word_ids = list(current_state)
+
+        # generate the rest of the sentence
+        while len(word_ids) < num_words:
+            if current_state in self.markov_dict:
+                # use the Dictogram's sample method to select the next word based on frequency, using the numerical probability values
+                next_id = self.markov_dict[current_state].sample()
+                # slide the state along by one word, O(order) for the tuple
+                current_state = current_state[1:] + (next_id,)
             else:
-                self.markov_dict[current_word] = Dictogram([next_word])
-    
+                # if we reach a state with no followers, choose another random state
+                # and carry on from its last word
+                current_state = random.choice(self.states)
+                next_id = current_state[-1]
+            word_ids.append(next_id)
+        return word_ids
+
     def generate_sentence(self, num_words=10):
         """Generate a sentence with the specified number of words."""
-        if not self.markov_dict:
+        if not (self.markov_dict or self.table):
             return "No words in the corpus"
-            
-        sentence = []
-        # the keys in self.markov_dict are all the unique words in the corpus
-        current_word = random.choice(list(self.markov_dict.keys()))
-        # create list of words that start with uppercase
-        capitalized_words = [word for word in self.markov_dict.keys() if word and isinstance(word, str) and word[0].isupper()]
-        # if list is populated replace starting word with word from capitalixed_words list
-        if capitalized_words:
-            current_word = random.choice(capitalized_words)
-        
-        sentence.append(current_word)
-        
-        # generate the rest of the sentence
-        for _ in range(num_words - 1):
-            if current_word in self.markov_dict:
-                # use the Dictogram's sample method to select the next word based on frequency, using the numerical probability values
-                next_word = self.markov_dict[current_word].sample()
-                sentence.append(next_word)
-                current_word = next_word
-            else:
-                # if we reach a word with no followers, choose another random word
-                current_word = random.choice(list(self.markov_dict.keys()))
-                sentence.append(current_word)
-        
-        
+
+        if self.table is not None:
+            word_ids = self.table.walk(num_words)
+        else:
+            word_ids = self._walk(num_words)
+        # a chain of high order starts with more words than were asked for
+        sentence = self.vocab.decode(word_ids[:max(num_words, 1)])
+
         # check if last word in sentence actually a string with isinstance
         # then check if last char in last word of sentence already has punctuation
-        if isinstance(sentence[-1], str) and sentence[-1][-1] not in [".", "!", "?"]:
+        if isinstance(sentence[-1], str) and sentence[-1][-1] not in SENTENCE_ENDINGS:
         # if both conditions are true (str and no punctuation), add random choice of closing punctuation
-            sentence[-1] = sentence[-1] + random.choice([".", "!", "?"])
-        
-        return " ".join(sentence)
\ No newline at end of file
+            sentence[-1] = sentence[-1] + random.choice(SENTENCE_ENDINGS)
+
+        return " ".join(sentence)
@@ -0,0 +1,150 @@
+#!python
+
+import markov_chain
+from markov_chain import MarkovChain, SENTENCE_ENDINGS
+import random
+import unittest
+
+
+class MarkovChainTest(unittest.TestCase):
+
+    # Test fixtures: two short sentences of fish words
+    fish_words = ['One', 'fish', 'two', 'fish.', 'Red', 'fish', 'blue', 'fish.']
+
+    def test_windows(self):
+        assert list(markov_chain.windows([1, 2, 3, 4], 2)) == [(1, 2), (2, 3), (3, 4)]
+        assert list(markov_chain.windows([1, 2, 3, 4], 4)) == [(1, 2, 3, 4)]
+        assert list(markov_chain.windows([1, 2], 3)) == []
+
+    def test_followers(self):
+        chain = MarkovChain(self.fish_words)
+        # Every word except the last one should map to its followers
+        assert chain.followers(['fish']) == {'two': 1, 'blue': 1}
+        assert chain.followers(['fish.']) == {'Red': 1}
+        assert chain.followers(['One']) == {'fish': 1}
+        assert chain.followers(['food']) == {}
+        assert len(chain.markov_dict) == 6
+
+    def test_vocab(self):
+        chain = MarkovChain(self.fish_words)
+        # Every distinct word should be interned once, in order of appearance
+        assert chain.vocab.words == ['One', 'fish', 'two', 'fish.', 'Red', 'blue']
+        # States should be tuples of word ids
+        for state in chain.markov_dict:
+            assert chain.vocab.decode(state)[0] in self.fish_words
+
+    def test_states(self):
+        chain = MarkovChain(self.fish_words)
+        # States should list every key of markov_dict in insertion order
+        assert chain.states == list(chain.markov_dict)
+
+    def test_start_states(self):
+        chain = MarkovChain(self.fish_words)
+        # Only capitalized words that begin a sentence should start states
+        start_words = [chain.vocab.decode(state) for state in chain.start_states]
+        assert start_words == [['One'], ['Red']]
+        assert chain.start_states.tokens == 2
+
+    def test_build_markov_dict_again(self):
+        chain = MarkovChain(self.fish_words)
+        # Building with more words should update the chain and its indexes
+        chain.build_markov_dict(['Red', 'fish', 'swims.'])
+        assert chain.followers(['fish']) == {'two': 1, 'blue': 1, 'swims.': 1}
+        assert chain.start_states.frequency(chain.vocab.encode(['Red'])) == 2
+        assert chain.states == list(chain.markov_dict)
+
+    def test_order_2(self):
+        chain = MarkovChain(self.fish_words, order=2)
+        assert chain.order == 2
+        # States should be pairs of words
+        assert chain.followers(['fish', 'two']) == {'fish.': 1}
+        assert chain.followers(['fish.', 'Red']) == {'fish': 1}
+        assert chain.followers(['two', 'fish']) == {}
+        assert len(chain.markov_dict) == 6
+        start_words = [chain.vocab.decode(state) for state in chain.start_states]
+        assert start_words == [['One', 'fish'], ['Red', 'fish']]
+
+    def test_build_from_iterator(self):
+        for order in (1, 2):
+            chain = MarkovChain(self.fish_words, order=order)
+            # Chains built from a one-pass iterator should be the same
+            streamed = MarkovChain(iter(self.fish_words), order=order)
+            assert streamed.vocab.words == chain.vocab.words
+            assert streamed.markov_dict == chain.markov_dict
+            assert streamed.start_states == chain.start_states
+
+    def test_build_in_small_batches(self):
+        batch_size = markov_chain.BATCH_SIZE
+        try:
+            for order in (1, 2, 3):
+                chain = MarkovChain(self.fish_words, order=order)
+                # States that span batches should be counted the same way
+                for markov_chain.BATCH_SIZE in (1, 2, 3):
+                    batched = MarkovChain(self.fish_words, order=order)
+                    assert batched.vocab.words == chain.vocab.words
+                    assert batched.markov_dict == chain.markov_dict
+                    assert list(batched.start_states.items()) == \
+                        list(chain.start_states.items())
+        finally:
+            markov_chain.BATCH_SIZE = batch_size
+
+    def test_invalid_order(self):
+        with self.assertRaises(ValueError):
+            MarkovChain(self.fish_words, order=0)
+
+    def test_generate_sentence(self):
+        for order in (1, 2, 3):
+            chain = MarkovChain(self.fish_words, order=order)
+            for _ in range(100):
+                words = chain.generate_sentence(num_words=5).split()
+                assert len(words) == 5
+                # Sentences should begin with a start word and end a sentence
+                assert words[0] in ('One', 'Red')
+                assert words[-1][-1] in SENTENCE_ENDINGS
+
+    def test_generate_short_sentence(self):
+        chain = MarkovChain(self.fish_words, order=3)
+        # Sentences shorter than the order should still have num_words words
+        assert len(chain.generate_sentence(num_words=2).split()) == 2
+
+    def test_generate_sentence_without_start_words(self):
+        chain = MarkovChain('one fish two fish red fish blue fish'.split())
+        # With no capitalized words, any word may begin the sentence
+        words = chain.generate_sentence(num_words=3).split()
+        assert len(words) == 3
+        assert words[0] in chain.vocab
+
+    def test_compile(self):
+        for order in (1, 2):
+            chain = MarkovChain(self.fish_words, order=order)
+            compiled = MarkovChain(self.fish_words, order=order).compile()
+            assert compiled.table is not None
+            assert len(compiled.table) == len(chain.markov_dict)
+            assert compiled.markov_dict == {}
+            # Compiled chain should have the same followers for every state
+            for state in chain.states:
+                words = chain.vocab.decode(state)
+                assert compiled.followers(words) == chain.followers(words)
+            # And generate the same sentences from the same random seed
+            for seed in range(20):
+                random.seed(seed)
+                sentence = chain.generate_sentence(num_words=12)
+                random.seed(seed)
+                assert compiled.generate_sentence(num_words=12) == sentence
+
+    def test_compiled_chain_is_frozen(self):
+        chain = MarkovChain(self.fish_words).compile()
+        with self.assertRaises(ValueError):
+            chain.build_markov_dict(['Red', 'fish'])
+
+    def test_compile_empty(self):
+        chain = MarkovChain([]).compile()
+        assert chain.generate_sentence() == 'No words in the corpus'
+
+    def test_empty(self):
+        chain = MarkovChain([])
+        assert chain.generate_sentence() == 'No words in the corpus'
+
+
+if __name__ == '__main__':
+    unittest.main()
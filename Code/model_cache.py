@@ -0,0 +1,122 @@
+#!python
+"""Save compiled Markov chains to disk, so a web server can load a trained
+model in milliseconds instead of cleaning and training on every startup.
+
+A model file is a one-line JSON header followed by the vocabulary (words
+joined by newlines, UTF-8) and the raw bytes of each TransitionTable array.
+Its name includes a hash of the corpus and the versions of the text cleaner
+and file format, so a changed corpus or cleaner never loads a stale model."""
+
+from array import array
+import glob
+import hashlib
+import json
+import os
+import sys
+
+from markov_chain import MarkovChain
+from text_cleaner import CLEANER_VERSION, iter_clean_words
+from transition_table import ARRAY_NAMES, TransitionTable
+from vocabulary import Vocabulary
+
+# bump this when the layout of model files changes
+FORMAT_VERSION = 1
+
+# directory model files are saved in by default
+CACHE_DIR = 'cache'
+
+
+def corpus_hash(file_path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of the contents of the given file."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_path(corpus_path, order=1, cache_dir=CACHE_DIR):
+    """Return the path of the model file for the given corpus and order."""
+    name = os.path.splitext(os.path.basename(corpus_path))[0]
+    return os.path.join(cache_dir, '{}-{}-order{}-clean{}-v{}.model'.format(
+        name, corpus_hash(corpus_path)[:16], order, CLEANER_VERSION, FORMAT_VERSION))
+
+
+def save_chain(chain, file_path):
+    """Compile the given Markov chain (if it isn't yet) and save it to the
+    given file path. The file is written under a temporary name and then
+    renamed, so other processes never see a half-written model."""
+    chain.compile()
+    table = chain.table
+    words = '\n'.join(chain.vocab.words).encode('utf-8')
+    header = {
+        'format': FORMAT_VERSION,
+        'order': chain.order,
+        'byteorder': sys.byteorder,
+        'words': len(words),
+        'arrays': [[name, getattr(table, name).typecode,
+                    getattr(table, name).itemsize, len(getattr(table, name))]
+                   for name in ARRAY_NAMES],
+    }
+    temp_path = '{}.{}.tmp'.format(file_path, os.getpid())
+    with open(temp_path, 'wb') as file:
+        file.write(json.dumps(header).encode('utf-8') + b'\n')
+        file.write(words)
+        for name in ARRAY_NAMES:
+            getattr(table, name).tofile(file)
+    os.replace(temp_path, file_path)
+
+
+def load_chain(file_path):
+    """Return the compiled Markov chain saved in the given file, or raise
+    ValueError if the file was saved in a format this code can't read."""
+    with open(file_path, 'rb') as file:
+        header = json.loads(file.readline().decode('utf-8'))
+        if header.get('format') != FORMAT_VERSION:
+            raise ValueError('Unsupported model format: {}'.format(header.get('format')))
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError('Model was saved on a machine with different byte order')
+        words = file.read(header['words']).decode('utf-8')
+        vocab = Vocabulary(words.split('\n') if words else [])
+        arrays = {}
+        for name, typecode, itemsize, length in header['arrays']:
+            values = array(typecode)
+            if values.itemsize != itemsize:
+                raise ValueError('Model array {} has item size {}, not {}'.format(
+                    name, itemsize, values.itemsize))
+            # fromfile raises EOFError if the file was cut short
+            values.fromfile(file, length)
+            arrays[name] = values
+    return MarkovChain.from_table(vocab, TransitionTable.from_arrays(header['order'], arrays))
+
+
+def load_or_build(corpus_path, order=1, cache_dir=CACHE_DIR):
+    """Return a compiled Markov chain of the given order for the corpus file,
+    loaded from cache_dir if it was saved there for the same corpus contents,
+    otherwise trained from the corpus and saved for next time. If the model
+    can't be saved, the trained chain is still returned."""
+    file_path = model_path(corpus_path, order, cache_dir)
+    if os.path.exists(file_path):
+        try:
+            return load_chain(file_path)
+        except (ValueError, EOFError, KeyError) as e:
+            print(f"Rebuilding unreadable model {file_path}: {e}")
+    chain = MarkovChain(iter_clean_words(corpus_path), order=order)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        save_chain(chain, file_path)
+        # remove models of older versions of this corpus, they can't be used again
+        name = os.path.splitext(os.path.basename(corpus_path))[0]
+        pattern = '{}-{}-order{}-*.model'.format(glob.escape(name), '[0-9a-f]' * 16, order)
+        for old_path in glob.glob(os.path.join(cache_dir, pattern)):
+            if old_path != file_path:
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    # another worker removed it first
+                    pass
+    except OSError as e:
+        # the chain is trained either way, so a cache that can't be written
+        # (such as a read-only file system) only costs training next time
+        print(f"Could not save model {file_path}: {e}")
+    return chain
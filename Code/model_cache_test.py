@@ -0,0 +1,88 @@
+#!python
+
+from markov_chain import MarkovChain
+import model_cache
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+
+class ModelCacheTest(unittest.TestCase):
+
+    fish_text = 'One fish two fish. Red fish blue fish.\n'
+
+    def setUp(self):
+        # Write corpora and models to a temporary directory
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+        self.corpus_path = os.path.join(self.temp_dir, 'fish.txt')
+        with open(self.corpus_path, 'w') as file:
+            file.write(self.fish_text)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_save_and_load(self):
+        for order in (1, 2):
+            chain = MarkovChain(self.fish_text.split(), order=order)
+            path = os.path.join(self.temp_dir, 'fish.model')
+            model_cache.save_chain(chain, path)
+            loaded = model_cache.load_chain(path)
+            assert loaded.order == order
+            assert loaded.vocab.words == chain.vocab.words
+            # Loaded chain should generate the same sentences
+            for seed in range(20):
+                random.seed(seed)
+                sentence = chain.generate_sentence(num_words=8)
+                random.seed(seed)
+                assert loaded.generate_sentence(num_words=8) == sentence
+
+    def test_save_and_load_empty(self):
+        path = os.path.join(self.temp_dir, 'empty.model')
+        model_cache.save_chain(MarkovChain([]), path)
+        loaded = model_cache.load_chain(path)
+        assert loaded.generate_sentence() == 'No words in the corpus'
+
+    def test_load_or_build(self):
+        chain = model_cache.load_or_build(self.corpus_path, cache_dir=self.cache_dir)
+        path = model_cache.model_path(self.corpus_path, cache_dir=self.cache_dir)
+        # First call should train the chain and save it
+        assert os.path.exists(path)
+        assert chain.followers(['fish']) == {'two': 1, 'blue': 1}
+        # Second call should load the saved chain
+        loaded = model_cache.load_or_build(self.corpus_path, cache_dir=self.cache_dir)
+        assert loaded.followers(['fish']) == {'two': 1, 'blue': 1}
+
+    def test_load_or_build_after_corpus_changes(self):
+        model_cache.load_or_build(self.corpus_path, cache_dir=self.cache_dir)
+        old_path = model_cache.model_path(self.corpus_path, cache_dir=self.cache_dir)
+        with open(self.corpus_path, 'a') as file:
+            file.write('Old fish swim.\n')
+        # A changed corpus should be retrained and replace the old model
+        chain = model_cache.load_or_build(self.corpus_path, cache_dir=self.cache_dir)
+        assert chain.followers(['fish']) == {'two': 1, 'blue': 1, 'swim.': 1}
+        assert not os.path.exists(old_path)
+        assert len(os.listdir(self.cache_dir)) == 1
+
+    def test_load_or_build_with_bad_model(self):
+        path = model_cache.model_path(self.corpus_path, cache_dir=self.cache_dir)
+        os.makedirs(self.cache_dir)
+        with open(path, 'w') as file:
+            file.write('{"format": 0}\n')
+        # An unreadable model should be rebuilt
+        chain = model_cache.load_or_build(self.corpus_path, cache_dir=self.cache_dir)
+        assert chain.followers(['fish']) == {'two': 1, 'blue': 1}
+        assert model_cache.load_chain(path).vocab.words == chain.vocab.words
+
+    def test_load_or_build_with_unwritable_cache(self):
+        # A cache directory inside a file can't be created
+        cache_dir = os.path.join(self.corpus_path, 'cache')
+        chain = model_cache.load_or_build(self.corpus_path, cache_dir=cache_dir)
+        assert chain.followers(['fish']) == {'two': 1, 'blue': 1}
+        assert not os.path.exists(cache_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
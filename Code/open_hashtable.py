@@ -0,0 +1,272 @@
+#!python
+
+from array import array
+
+# markers for slots that never held an entry, and slots whose entry was
+# deleted (tombstones), which lookups must probe past
+_EMPTY = object()
+_DELETED = object()
+
+
+class OpenHashTable(object):
+    """OpenHashTable has the same single-key methods as HashTable (set, get,
+    contains, delete, length and iteration, but not the bulk methods or
+    stats), and stores entries by open addressing instead of chaining:
+    every entry lives in one of three parallel arrays (keys, values and
+    cached hash codes) at a slot found by linear probing, so there's no
+    Node or tuple object per entry.
+
+    A key is stored at the first free slot at or after hash(key) mod capacity,
+    wrapping around. Deleting leaves a tombstone in the slot, so lookups keep
+    probing past it to keys that were stored after it."""
+
+    def __init__(self, init_size=8, max_load_factor=0.66, min_load_factor=None):
+        """Initialize this hash table with at least the given number of slots,
+        rounded up to a power of two so a slot index is hash & (capacity - 1).
+        The number of slots doubles when the load factor (used slots, counting
+        tombstones, per slot) goes above max_load_factor (or the slots are
+        rehashed to clear tombstones, if they are most of the used slots), and halves (but not
+        below init_size) when a delete takes it below min_load_factor, if that
+        is given."""
+        if not 0 < max_load_factor < 1:
+            # probing needs at least one empty slot to know when to stop
+            raise ValueError('max_load_factor must be between 0 and 1')
+        if min_load_factor is not None and min_load_factor * 4 > max_load_factor:
+            # halving the slots (which also drops every tombstone) just under
+            # min_load_factor leaves at most half of max_load_factor of them
+            # used, so the table takes as many new keys as it holds before it
+            # has to grow back
+            raise ValueError('min_load_factor must be at most max_load_factor / 4')
+        capacity = 1
+        while capacity < init_size:
+            capacity *= 2
+        self.init_size = capacity
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Replace the slots with capacity empty ones."""
+        self._keys = [_EMPTY] * capacity
+        self._values = [None] * capacity
+        # hash codes are 64-bit ints on 64-bit Python, which fit array('q')
+        self._hashes = array('q', bytes(8 * capacity))
+        self._mask = capacity - 1
+        self.size = 0  # Number of entries
+        self.tombstones = 0  # Number of deleted slots not yet reused
+
+    def __str__(self):
+        """Return a formatted string representation of this hash table."""
+        items = ('{!r}: {!r}'.format(key, val) for key, val in self.iter_items())
+        return '{' + ', '.join(items) + '}'
+
+    def __repr__(self):
+        """Return a string representation of this hash table."""
+        return 'OpenHashTable([' + ', '.join(map(repr, self.iter_items())) + '])'
+
+    def __iter__(self):
+        """Return an iterator over the keys of this hash table, like a dict."""
+        return self.iter_keys()
+
+    def __len__(self):
+        """Return the number of key-value entries, so len(ht) works.
+        Running time: O(1) because the number of entries is tracked."""
+        return self.size
+
+    def capacity(self):
+        """Return the number of slots."""
+        return len(self._keys)
+
+    def load_factor(self):
+        """Return the load factor, the fraction of slots that are used by
+        entries or tombstones. Both make probe sequences longer."""
+        return (self.size + self.tombstones) / len(self._keys)
+
+    def _find_slot(self, key, key_hash):
+        """Return the slot index that holds the given key, or -1 if there
+        isn't one. Probes from the key's home slot until it finds the key or
+        an empty slot, skipping tombstones. Comparing the cached hash codes
+        first avoids calling __eq__ on keys that can't be equal."""
+        keys = self._keys
+        hashes = self._hashes
+        mask = self._mask
+        index = key_hash & mask
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                return -1
+            if hashes[index] == key_hash and slot_key is not _DELETED and (
+                    slot_key is key or slot_key == key):
+                return index
+            index = (index + 1) & mask
+
+    def _resize(self, new_capacity):
+        """Move every entry into new_capacity slots, dropping tombstones.
+        Running time: O(n + c) for n entries and c slots, but it only happens
+        after the used slots have doubled or the entries have halved, so each
+        set or delete pays O(1) for resizing on average (amortized)."""
+        old_keys = self._keys
+        old_values = self._values
+        old_hashes = self._hashes
+        self._allocate(new_capacity)
+        keys = self._keys
+        values = self._values
+        hashes = self._hashes
+        mask = self._mask
+        for old_index, key in enumerate(old_keys):
+            if key is _EMPTY or key is _DELETED:
+                continue
+            key_hash = old_hashes[old_index]
+            # keys are already unique, so take the first empty slot
+            index = key_hash & mask
+            while keys[index] is not _EMPTY:
+                index = (index + 1) & mask
+            keys[index] = key
+            values[index] = old_values[old_index]
+            hashes[index] = key_hash
+            self.size += 1
+
+    def iter_items(self):
+        """Yield each item (key-value pair) in this hash table, one at a time,
+        without building a list of them. Like a dict, the hash table should
+        not be changed while it is being iterated.
+        Running time: O(c) for c slots to yield them all, because every slot
+        is checked, but only O(1) extra memory."""
+        for key, value in zip(self._keys, self._values):
+            if key is not _EMPTY and key is not _DELETED:
+                yield key, value
+
+    def iter_keys(self):
+        """Yield each key in this hash table, one at a time, see iter_items."""
+        for key in self._keys:
+            if key is not _EMPTY and key is not _DELETED:
+                yield key
+
+    def iter_values(self):
+        """Yield each value in this hash table, one at a time, see iter_items."""
+        for key, value in zip(self._keys, self._values):
+            if key is not _EMPTY and key is not _DELETED:
+                yield value
+
+    def keys(self):
+        """Return a list of all keys in this hash table.
+        Running time: O(c) for c slots, because every slot is checked."""
+        return list(self.iter_keys())
+
+    def values(self):
+        """Return a list of all values in this hash table.
+        Running time: O(c) for c slots, because every slot is checked."""
+        return list(self.iter_values())
+
+    def items(self):
+        """Return a list of all items (key-value pairs) in this hash table.
+        Running time: O(c) for c slots, because every slot is checked."""
+        return list(self.iter_items())
+
+    def length(self):
+        """Return the number of key-value entries.
+        Running time: O(1) because set and delete keep count of the entries."""
+        return self.size
+
+    def contains(self, key):
+        """Return True if this hash table contains the given key, or False.
+        Running time: O(1) on average, because the load factor is kept below
+        max_load_factor, so probe sequences stay short."""
+        return self._find_slot(key, hash(key)) >= 0
+
+    def get(self, key):
+        """Return the value associated with the given key, or raise KeyError.
+        Running time: O(1) on average, same as contains."""
+        index = self._find_slot(key, hash(key))
+        if index < 0:
+            raise KeyError('Key not found: {}'.format(key))
+        return self._values[index]
+
+    def set(self, key, value):
+        """Insert or update the given key with its associated value.
+        Running time: O(1) on average (amortized over resizes). A new key
+        goes in the first tombstone it probed past, if any, so deleted slots
+        are reused instead of making probe sequences longer."""
+        key_hash = hash(key)
+        keys = self._keys
+        hashes = self._hashes
+        mask = self._mask
+        index = key_hash & mask
+        free_index = -1  # first tombstone on the probe sequence
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                break
+            if slot_key is _DELETED:
+                if free_index < 0:
+                    free_index = index
+            elif hashes[index] == key_hash and (slot_key is key or slot_key == key):
+                # If found, update value
+                self._values[index] = value
+                return
+            index = (index + 1) & mask
+        # If not found, add new entry
+        if free_index >= 0:
+            index = free_index
+            self.tombstones -= 1
+        keys[index] = key
+        self._values[index] = value
+        hashes[index] = key_hash
+        self.size += 1
+        # Rehash if probe sequences are getting too long on average. Grow if
+        # entries fill over half of that, otherwise most used slots are
+        # tombstones, and rehashing at the same capacity clears them.
+        if self.load_factor() > self.max_load_factor:
+            if self.size * 2 > self.max_load_factor * len(keys):
+                self._resize(len(keys) * 2)
+            else:
+                self._resize(len(keys))
+
+    def delete(self, key):
+        """Delete the given key from this hash table, or raise KeyError.
+        Running time: O(1) on average (amortized over resizes), same as contains."""
+        index = self._find_slot(key, hash(key))
+        if index < 0:
+            raise KeyError('Key not found: {}'.format(key))
+        # Leave a tombstone so later keys on this probe sequence are still found
+        self._keys[index] = _DELETED
+        self._values[index] = None
+        self.size -= 1
+        self.tombstones += 1
+        # Shrink if most slots are empty, but never below the initial size
+        if (self.min_load_factor is not None
+                and self.size / len(self._keys) < self.min_load_factor
+                and len(self._keys) // 2 >= self.init_size):
+            self._resize(len(self._keys) // 2)
+
+
+def test_open_hash_table():
+    ht = OpenHashTable()
+    print('hash table: {}'.format(ht))
+
+    print('\nTesting set:')
+    for key, value in [('I', 1), ('V', 5), ('X', 10)]:
+        print('set({!r}, {!r})'.format(key, value))
+        ht.set(key, value)
+        print('hash table: {}'.format(ht))
+
+    print('\nTesting get:')
+    for key in ['I', 'V', 'X']:
+        value = ht.get(key)
+        print('get({!r}): {!r}'.format(key, value))
+
+    print('contains({!r}): {}'.format('X', ht.contains('X')))
+    print('length: {}'.format(ht.length()))
+
+    print('\nTesting delete:')
+    for key in ['I', 'V', 'X']:
+        print('delete({!r})'.format(key))
+        ht.delete(key)
+        print('hash table: {}'.format(ht))
+
+    print('contains(X): {}'.format(ht.contains('X')))
+    print('length: {}'.format(ht.length()))
+
+
+if __name__ == '__main__':
+    test_open_hash_table()
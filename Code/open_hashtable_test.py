@@ -0,0 +1,129 @@
+#!python
+
+from open_hashtable import OpenHashTable
+import unittest
+
+
+class CollidingKey(object):
+    """Key whose hash codes are all the same, to force long probe sequences."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and self.name == other.name
+
+    def __repr__(self):
+        return 'CollidingKey({!r})'.format(self.name)
+
+
+class OpenHashTableTest(unittest.TestCase):
+
+    def test_init(self):
+        ht = OpenHashTable(4)
+        assert ht.capacity() == 4
+        assert ht.length() == 0
+        assert OpenHashTable(5).capacity() == 8  # Rounded up to a power of two
+        with self.assertRaises(ValueError):
+            OpenHashTable(max_load_factor=1)  # No empty slot to stop probing
+
+    def test_keys_values_items(self):
+        ht = OpenHashTable()
+        assert ht.keys() == []
+        assert ht.items() == []
+        ht.set('I', 1)
+        ht.set('V', 5)
+        ht.set('X', 10)
+        self.assertCountEqual(ht.keys(), ['I', 'V', 'X'])
+        self.assertCountEqual(ht.values(), [1, 5, 10])
+        self.assertCountEqual(ht.items(), [('I', 1), ('V', 5), ('X', 10)])
+        assert str(ht).count(':') == 3
+        self.assertCountEqual(ht, ['I', 'V', 'X'])  # Iterates over keys
+        assert list(ht.iter_keys()) == ht.keys()
+        assert list(ht.iter_values()) == ht.values()
+        assert list(ht.iter_items()) == ht.items()
+        assert repr(ht) == 'OpenHashTable({!r})'.format(ht.items())
+
+    def test_set_and_get(self):
+        ht = OpenHashTable()
+        ht.set('I', 1)
+        ht.set('V', 4)
+        ht.set('V', 5)  # Update value
+        assert ht.get('I') == 1
+        assert ht.get('V') == 5
+        assert ht.length() == 2
+        assert len(ht) == 2
+        assert ht.contains('V') is True
+        assert ht.contains('A') is False
+        with self.assertRaises(KeyError):
+            ht.get('A')  # Key does not exist
+
+    def test_delete(self):
+        ht = OpenHashTable()
+        ht.set('I', 1)
+        ht.set('V', 5)
+        ht.set('X', 10)
+        ht.delete('I')
+        ht.delete('X')
+        assert ht.length() == 1
+        assert ht.items() == [('V', 5)]
+        with self.assertRaises(KeyError):
+            ht.delete('X')  # Key no longer exists
+        with self.assertRaises(KeyError):
+            ht.delete('A')  # Key does not exist
+
+    def test_tombstones(self):
+        ht = OpenHashTable(16)
+        keys = [CollidingKey(name) for name in 'ABCD']
+        for i, key in enumerate(keys):
+            ht.set(key, i)
+        # B is deleted from the middle of the probe sequence, C and D must
+        # still be found past its tombstone
+        ht.delete(CollidingKey('B'))
+        assert ht.tombstones == 1
+        assert ht.get(CollidingKey('C')) == 2
+        assert ht.get(CollidingKey('D')) == 3
+        assert ht.contains(CollidingKey('B')) is False
+        # Setting an existing key past the tombstone updates it, not reuses it
+        ht.set(CollidingKey('D'), 30)
+        assert ht.length() == 3
+        assert ht.tombstones == 1
+        # A new key reuses the tombstone
+        ht.set(CollidingKey('E'), 4)
+        assert ht.tombstones == 0
+        assert ht.get(CollidingKey('E')) == 4
+        assert ht.get(CollidingKey('D')) == 30
+
+    def test_tombstones_are_cleared(self):
+        ht = OpenHashTable(8)
+        # Set and delete many keys, which would fill every slot with
+        # tombstones if they were never cleared
+        for i in range(1000):
+            ht.set(i, i)
+            ht.delete(i)
+            assert ht.load_factor() <= ht.max_load_factor
+        assert ht.capacity() == 8
+        assert ht.length() == 0
+
+    def test_resize(self):
+        ht = OpenHashTable(4)
+        for i in range(100):
+            ht.set(i, i * i)
+            assert ht.load_factor() <= ht.max_load_factor
+        assert ht.capacity() == 256
+        for i in range(100):
+            assert ht.get(i) == i * i
+        ht = OpenHashTable(4, min_load_factor=0.1)
+        for i in range(100):
+            ht.set(i, i)
+        for i in range(100):
+            ht.delete(i)
+        assert ht.capacity() == 4  # Never shrinks below the initial size
+        assert ht.items() == []
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!python
+"""Train Markov chains on several processes at once.
+
+The words of a corpus are split into shards on word boundaries, each shard is
+counted into a partial MarkovChain in a worker process, and the partial chains
+are merged in order. Every shard also gets the word before it and the order
+words after it, so the transitions that cross a boundary between shards are
+counted once, by the shard they start in. The merged chain is identical to
+the one MarkovChain builds from the whole text in one process: same
+vocabulary ids, same states and counts, all in the same order."""
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from markov_chain import MarkovChain
+from text_cleaner import iter_clean_words
+
+
+def train_parallel(word_list, order=1, num_shards=None, max_workers=None):
+    """Return a MarkovChain of the given order trained on the list of words,
+    split into num_shards shards (one per worker by default) and counted by
+    up to max_workers processes (one per CPU by default)."""
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if num_shards is None:
+        num_shards = max_workers
+    shard_words = []
+    previous_words = []
+    shard_size = max(-(-len(word_list) // max(num_shards, 1)), 1)  # round up
+    for start in range(0, len(word_list), shard_size):
+        # states that begin in this shard need up to order words after it
+        shard_words.append(word_list[start:start + shard_size + order])
+        previous_words.append(word_list[start - 1] if start > 0 else None)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        chains = executor.map(_train_shard, shard_words,
+                              [order] * len(shard_words), previous_words)
+        return _merge_chains(chains, order)
+
+
+def train_files_parallel(paths, order=1, max_workers=None):
+    """Return a MarkovChain of the given order trained on a corpus file, a
+    list of corpus files, or every .txt file in a directory (in name order).
+    Each file is cleaned and counted in its own worker process, and no
+    transitions cross from one file into the next, the same as calling
+    build_markov_dict once per file."""
+    if isinstance(paths, str):
+        if os.path.isdir(paths):
+            paths = [os.path.join(paths, name) for name in sorted(os.listdir(paths))
+                     if name.endswith('.txt')]
+        else:
+            paths = [paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        chains = executor.map(_train_file, paths, [order] * len(paths))
+        return _merge_chains(chains, order)
+
+
+def _train_shard(words, order, previous_word):
+    """Return a MarkovChain of the states that begin in the given shard, where
+    words is the shard plus the order words after it."""
+    chain = MarkovChain([], order=order)
+    chain.build_markov_dict(words, previous_word=previous_word)
+    # compiled chains are a few flat arrays, much faster to send back to the
+    # main process than thousands of Dictograms
+    return chain.compile()
+
+
+def _train_file(path, order):
+    """Return a compiled MarkovChain trained on the cleaned words of the given file."""
+    return MarkovChain(iter_clean_words(path), order=order).compile()
+
+
+def _merge_chains(chains, order):
+    """Return a new MarkovChain with the given chains merged into it, in order."""
+    merged = MarkovChain([], order=order)
+    for chain in chains:
+        merged.merge(chain)
+    return merged
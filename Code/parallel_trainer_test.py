@@ -0,0 +1,69 @@
+#!python
+
+from markov_chain import MarkovChain
+from parallel_trainer import train_parallel, train_files_parallel
+from text_cleaner import iter_clean_words
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class ParallelTrainerTest(unittest.TestCase):
+
+    words = list(iter_clean_words('data/sample.txt'))
+
+    def assertSameChain(self, chain, expected):
+        # Chains should match in content and in order, down to the arrays
+        assert chain.order == expected.order
+        assert chain.vocab.words == expected.vocab.words
+        assert chain.states == expected.states
+        for state in expected.states:
+            assert list(chain.markov_dict[state].items()) == \
+                list(expected.markov_dict[state].items())
+        assert list(chain.start_states.items()) == list(expected.start_states.items())
+        chain.compile()
+        expected.compile()
+        for name in ('states', 'offsets', 'followers', 'cumulative', 'next_rows',
+                     'start_rows', 'start_cumulative'):
+            assert getattr(chain.table, name) == getattr(expected.table, name)
+
+    def test_train_parallel(self):
+        for order in (1, 2, 3):
+            for num_shards in (1, 2, 5, 37):
+                expected = MarkovChain(self.words, order=order)
+                chain = train_parallel(self.words, order=order,
+                                       num_shards=num_shards, max_workers=2)
+                self.assertSameChain(chain, expected)
+
+    def test_train_parallel_tiny_shards(self):
+        # Shards shorter than the order should still join up correctly
+        words = 'One fish. Two fish. Red fish! Blue fish?'.split()
+        for order in (1, 2, 3):
+            chain = train_parallel(words, order=order, num_shards=len(words), max_workers=2)
+            self.assertSameChain(chain, MarkovChain(words, order=order))
+
+    def test_train_parallel_empty(self):
+        chain = train_parallel([], max_workers=2)
+        assert chain.generate_sentence() == 'No words in the corpus'
+
+    def test_train_files_parallel(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            texts = ['One fish two fish.', 'Red fish blue fish.', 'Old fish new fish.']
+            for number, text in enumerate(texts):
+                with open(os.path.join(temp_dir, 'part{}.txt'.format(number)), 'w') as file:
+                    file.write(text)
+            # Should match building the chain one file at a time
+            expected = MarkovChain([], order=2)
+            for number in range(len(texts)):
+                path = os.path.join(temp_dir, 'part{}.txt'.format(number))
+                expected.build_markov_dict(iter_clean_words(path))
+            chain = train_files_parallel(temp_dir, order=2, max_workers=2)
+            self.assertSameChain(chain, expected)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
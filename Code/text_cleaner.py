@@ -1,5 +1,13 @@
+import codecs
 import re
 
+# number of characters iter_clean_words reads from the corpus at a time
+CHUNK_SIZE = 64 * 1024
+
+# bump this when the cleaning rules change, so models cached from words
+# cleaned the old way are rebuilt (see model_cache.py)
+CLEANER_VERSION = 1
+
 def clean_corpus(file_path):
     """
     Load and clean corpus from file and return it as a list of words.
@@ -8,50 +16,119 @@ def clean_corpus(file_path):
     Returns:
         list: Cleaned list of words from the corpus
     """
-    # utf-8 is most common encoding so try that first
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return _process_text(file.read())
-    except UnicodeDecodeError:
-        # ry with different encoding if UTF-8 fails
-        with open(file_path, 'r', encoding='latin-1') as file:
-            return _process_text(file.read())
+        return list(iter_clean_words(file_path))
     except Exception as e:
         print(f"Error loading corpus: {e}")
         # return empty list as fallback
         return []
+
+def iter_clean_words(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Load and clean corpus from file a chunk at a time, yielding cleaned words.
+    Memory use stays around chunk_size no matter how big the file is, plus
+    the longest run of text without whitespace (see iter_text_chunks).
+    Args:
+        file_path (str): Path to the corpus file
+        chunk_size (int): Number of characters to read at a time
+    Yields:
+        str: Cleaned words from the corpus, same as clean_corpus returns
+    """
+    encoding = _detect_encoding(file_path)
+    with open(file_path, 'r', encoding=encoding) as file:
+        # every cleaning rule works within a run of non-whitespace, so
+        # cutting the text at whitespace doesn't change the words
+        for text in iter_text_chunks(file, chunk_size):
+            yield from _process_text(text)
+
+def iter_text_chunks(file, chunk_size=CHUNK_SIZE):
+    """
+    Read an open text file chunk_size characters at a time and yield its text
+    in pieces that end on whitespace (except the last one), so no word is
+    split between two pieces. A run of text without whitespace is held until
+    it ends, so memory use is about chunk_size plus the longest such run.
+    Args:
+        file: Text file object open for reading
+        chunk_size (int): Number of characters to read at a time
+    Yields:
+        str: Consecutive pieces of the file's text
+    """
+    # text after the last whitespace read so far may be the start of a word
+    # that continues in the next chunk, so hold it back. It's kept as a list
+    # of chunks, so a long run without whitespace isn't copied every chunk.
+    pending = []
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        # only the new chunk is searched for its last whitespace. rsplit
+        # finds it from the right in C, and the text after it is the last item
+        if chunk[-1].isspace():
+            cut = len(chunk)
+        else:
+            cut = len(chunk) - len(chunk.rsplit(None, 1)[-1])
+        if cut == 0:
+            # no whitespace in this chunk, so the run goes on
+            pending.append(chunk)
+            continue
+        pending.append(chunk[:cut])
+        yield ''.join(pending)
+        pending = [chunk[cut:]]
+    text = ''.join(pending)
+    if text:
+        yield text
+
+def _detect_encoding(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Return 'utf-8' if the whole file decodes as UTF-8, or 'latin-1' if not.
+    The file is checked a chunk at a time so it is never read in whole.
+    """
+    # utf-8 is most common encoding so try that first
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        # try with different encoding if UTF-8 fails
+        return 'latin-1'
+    return 'utf-8'
+
+class _CleanTable(dict):
+    """
+    str.translate table that turns special characters, digits, double quotes
+    and non sentence-ending punctuation into spaces and leaves everything
+    else alone. Any Unicode digit counts, like the \\d regex it replaces,
+    so each new character is looked up once and then cached.
+    """
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        self[codepoint] = ord(' ') if char.isdecimal() else codepoint
+        return self[codepoint]
+
+# remove special characters (chemical formulas, footnotes), double quotation
+# marks (") and punctuation other than sentence endings, plus digits (above)
+_CLEAN_TABLE = _CleanTable((ord(char), ord(' ')) for char in '_*[]{}",:;()')
+
+# a word is a run of non-whitespace, but apostrophes are only kept when
+# bounded on both sides by letters (like don't), other apostrophes split words
+_WORD_PATTERN = re.compile(r"[^\s']+(?:(?<=\w)'(?=\w)[^\s']+)*")
+
+# words made only of these characters are dropped
+_PUNCTUATION = '._-–—'
+
 # leading underscore is a naming convention to indicate helper function
 def _process_text(text):
     """
     Process text with regex cleaning to prepare for Markov chain.
+    Characters are removed with one str.translate pass, then words are found
+    with one regex pass, instead of rescanning the text once per rule.
     Args:
         text (str): Raw text input
     Returns:
         list: Cleaned list of words
     """
-    # replace newlines with spaces
-    text = text.replace('\n', ' ')
-    
-    # remove chemical formulas, footnotes, and other unusual patterns
-    text = re.sub(r'[_\*\[\]\{\}]', ' ', text)  # remove special characters
-    text = re.sub(r'\d+', ' ', text)  # remove standalone numbers
-    text = re.sub(r'([A-Z])(\d)', r'\1 \2', text)  # separate uppercase letters and numbers
-    text = re.sub(r'([a-z])(\d)', r'\1 \2', text)  # separate lowercase letters and numbers
-    
-    # remove double quotation marks (") 
-    text = text.replace('"', ' ')
-    
-    # apostrophes bounded on either or both sides by letters are safe from the cleaner
-    text = re.sub(r'(\w)\'(\w)', r'\1\'\2', text)  
-    text = re.sub(r'(?<!\w)\'|\'(?!\w)', ' ', text)
-    
-    # keep sentence-ending punctuation but remove other punctuation
-    text = re.sub(r'[,:;()[\]{}]', ' ', text)  
-    
-    # replace multiple spaces with single space
-    text = re.sub(r'\s+', ' ', text)
-    
-    # split into words and remove empty strings or strings with only punctuation
-    words = [word for word in text.split() if word and not all(c in '._-–—' for c in word)]
-    
-    return words
\ No newline at end of file
+    text = text.translate(_CLEAN_TABLE)
+    # remove empty strings or strings with only punctuation
+    return [word for word in _WORD_PATTERN.findall(text) if word.strip(_PUNCTUATION)]
@@ -0,0 +1,71 @@
+#!python
+
+from text_cleaner import clean_corpus, iter_clean_words, iter_text_chunks, _process_text
+import io
+import unittest
+
+SAMPLE_PATH = 'data/sample.txt'
+
+
+class TextCleanerTest(unittest.TestCase):
+
+    def test_clean_corpus(self):
+        words = clean_corpus(SAMPLE_PATH)
+        assert len(words) > 0
+        # Cleaned words should have no whitespace or removed characters
+        for word in words:
+            assert word.split() == [word]
+            assert not any(char in word for char in '"_*[]{},:;()0123456789')
+
+    def test_process_text(self):
+        # Special characters, digits, quotes and punctuation become spaces
+        assert _process_text('"Hello," (she) said: [1897] A2B_C.') == \
+            ['Hello', 'she', 'said', 'A', 'B', 'C.']
+        # Sentence-ending punctuation stays, but punctuation-only words go
+        assert _process_text('Stop! Who? -- ... end.') == ['Stop!', 'Who?', 'end.']
+
+    def test_process_text_apostrophes(self):
+        # Apostrophes between letters are kept, quoting apostrophes are not
+        assert _process_text("don't 'tis the dogs' rock'n'roll") == \
+            ["don't", 'tis', 'the', 'dogs', "rock'n'roll"]
+
+    def test_clean_corpus_missing_file(self):
+        # Missing files should fall back to an empty list
+        assert clean_corpus('data/no_such_file.txt') == []
+
+    def test_iter_clean_words(self):
+        words = clean_corpus(SAMPLE_PATH)
+        # Streaming words should give the same words as cleaning all at once
+        assert list(iter_clean_words(SAMPLE_PATH)) == words
+
+    def test_iter_clean_words_small_chunks(self):
+        words = clean_corpus(SAMPLE_PATH)
+        # Words split across chunk boundaries should be put back together
+        for chunk_size in (1, 2, 3, 7, 64):
+            assert list(iter_clean_words(SAMPLE_PATH, chunk_size)) == words
+
+    def test_iter_clean_words_is_lazy(self):
+        words = iter_clean_words(SAMPLE_PATH, chunk_size=16)
+        # Generator should yield words before the whole file is read
+        assert next(words) == clean_corpus(SAMPLE_PATH)[0]
+
+    def test_iter_text_chunks(self):
+        text = 'One fish  two\nfish red fish'
+        for chunk_size in (1, 2, 3, 7, 64):
+            chunks = list(iter_text_chunks(io.StringIO(text), chunk_size))
+            # Chunks should put the whole text back together
+            assert ''.join(chunks) == text
+            # and every chunk but the last should end on whitespace
+            for chunk in chunks[:-1]:
+                assert chunk[-1].isspace()
+        assert list(iter_text_chunks(io.StringIO(''))) == []
+
+    def test_iter_text_chunks_without_whitespace(self):
+        # A long run without whitespace comes out whole, in one chunk
+        text = 'x' * 1000 + ' y'
+        assert list(iter_text_chunks(io.StringIO(text), 7)) == ['x' * 1000 + ' ', 'y']
+        assert list(iter_text_chunks(io.StringIO(' ' + 'x' * 50), 8)) == [' ', 'x' * 50]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+#!python
+
+from array import array
+from bisect import bisect_left
+import random
+
+# names of the array attributes that hold all of a table's data
+ARRAY_NAMES = ('states', 'offsets', 'followers', 'cumulative', 'next_rows',
+               'start_rows', 'start_cumulative')
+
+
+class TransitionTable(object):
+    """TransitionTable is a frozen, compact copy of a Markov chain's states and
+    transition counts, stored in flat arrays of ints in CSR layout (compressed
+    sparse rows, the layout sparse matrix libraries use).
+
+    Each state gets a row number. The followers of row r are at indexes
+    offsets[r] up to offsets[r + 1] of the parallel arrays:
+      followers:  word id of each follower
+      cumulative: running total of follower counts within the row
+      next_rows:  row of the state reached by following that word, or -1
+    so a random walk only ever indexes arrays and never hashes a state."""
+
+    def __init__(self, markov_dict, start_states, order):
+        """Initialize this table from a dict mapping each state (tuple of order
+        word ids) to a Dictogram of next word ids, and a Dictogram of start
+        states. Rows and followers keep the same order as the dicts."""
+        self.order = order
+        # row number of each state, only needed while building
+        rows = {}
+        for state in markov_dict:
+            rows[state] = len(rows)
+        # word ids of each row's state, order ids per row
+        self.states = array('I')
+        self.offsets = array('I', [0])
+        self.followers = array('I')
+        self.cumulative = array('I')
+        self.next_rows = array('i')
+        for state, histogram in markov_dict.items():
+            self.states.extend(state)
+            total = 0
+            for word_id, count in histogram.items():
+                total += count
+                self.followers.append(word_id)
+                self.cumulative.append(total)
+                # slide the state along by one word to find the next row
+                self.next_rows.append(rows.get(state[1:] + (word_id,), -1))
+            self.offsets.append(len(self.followers))
+        # start states as rows with running totals of their counts
+        self.start_rows = array('I')
+        self.start_cumulative = array('I')
+        total = 0
+        for state, count in start_states.items():
+            total += count
+            self.start_rows.append(rows[state])
+            self.start_cumulative.append(total)
+        # state -> row lookup for row(), rebuilt from states when first needed
+        self._rows = None
+
+    @classmethod
+    def from_arrays(cls, order, arrays):
+        """Return a table made from a dict of arrays named like the attributes
+        in ARRAY_NAMES, such as arrays saved by model_cache."""
+        table = cls.__new__(cls)
+        table.order = order
+        for name in ARRAY_NAMES:
+            setattr(table, name, arrays[name])
+        table._rows = None
+        return table
+
+    def __len__(self):
+        """Return the number of states (rows) in this table."""
+        return len(self.offsets) - 1
+
+    def __contains__(self, state):
+        """Return True if given state has a row in this table."""
+        return self.row(state) is not None
+
+    def state(self, row):
+        """Return the state (tuple of word ids) of the given row."""
+        return tuple(self.states[row * self.order:(row + 1) * self.order])
+
+    def row(self, state):
+        """Return the row of given state, or None if it is not in this table.
+        The first call is O(n) to build a lookup dict, after that it is O(1)."""
+        if self._rows is None:
+            self._rows = {self.state(row): row for row in range(len(self))}
+        return self._rows.get(state)
+
+    def items(self, row):
+        """Return a list of (word id, count) entries following the given row."""
+        entries = []
+        previous = 0
+        for index in range(self.offsets[row], self.offsets[row + 1]):
+            entries.append((self.followers[index], self.cumulative[index] - previous))
+            previous = self.cumulative[index]
+        return entries
+
+    def iter_rows(self):
+        """Yield (state, list of (word id, count) entries) for every row in
+        order, a faster way to read the whole table than state() and items()."""
+        order = self.order
+        states = self.states
+        offsets = self.offsets
+        followers = self.followers
+        cumulative = self.cumulative
+        for row in range(len(self)):
+            start = offsets[row]
+            end = offsets[row + 1]
+            totals = cumulative[start:end]
+            # counts are the differences between running totals
+            counts = [totals[0]]
+            counts.extend(map(int.__sub__, totals[1:], totals))
+            yield tuple(states[row * order:row * order + order]), list(zip(followers[start:end], counts))
+
+    def start_items(self):
+        """Return a list of (start state, count) entries."""
+        entries = []
+        previous = 0
+        for row, total in zip(self.start_rows, self.start_cumulative):
+            entries.append((self.state(row), total - previous))
+            previous = total
+        return entries
+
+    def _sample_index(self, row):
+        """Return the array index of a follower of the given row, randomly
+        sampled by weighting each follower by its count.
+        Running time: O(log n) for n followers, by binary search of the
+        running totals (same draw Dictogram.sample makes for the row)."""
+        start = self.offsets[row]
+        end = self.offsets[row + 1]
+        random_value = random.randint(1, self.cumulative[end - 1])
+        return bisect_left(self.cumulative, random_value, start, end)
+
+    def walk(self, num_words):
+        """Return a list of num_words word ids from a random walk of the chain,
+        starting from a sampled start state (or any state if there are none)
+        and jumping to a random state when it reaches one with no followers."""
+        order = self.order
+        if self.start_rows:
+            random_value = random.randint(1, self.start_cumulative[-1])
+            row = self.start_rows[bisect_left(self.start_cumulative, random_value)]
+        else:
+            row = random.randrange(len(self))
+        word_ids = list(self.state(row))
+        while len(word_ids) < num_words:
+            if row >= 0:
+                index = self._sample_index(row)
+                word_ids.append(self.followers[index])
+                row = self.next_rows[index]
+            else:
+                row = random.randrange(len(self))
+                word_ids.append(self.states[row * order + order - 1])
+        return word_ids
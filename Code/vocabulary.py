@@ -0,0 +1,58 @@
+#!python
+
+
+class Vocabulary(object):
+    """Vocabulary interns words as small integer ids, so data structures can
+    store one int per word instead of many copies of the same string."""
+
+    def __init__(self, words=None):
+        """Initialize this vocabulary and intern the given words, if any."""
+        self.words = []  # Word for each id, in order of first appearance
+        self.ids = {}  # Id for each word
+        if words is not None:
+            for word in words:
+                self.intern(word)
+
+    def __len__(self):
+        """Return the number of distinct words in this vocabulary."""
+        return len(self.words)
+
+    def __contains__(self, word):
+        """Return True if given word has an id in this vocabulary."""
+        return word in self.ids
+
+    def __repr__(self):
+        """Return a string representation of this vocabulary."""
+        return 'Vocabulary({!r})'.format(self.words)
+
+    def intern(self, word):
+        """Return the id of given word, giving it the next id if it is new.
+        Running time: O(1) on average because it is one dict lookup."""
+        word_id = self.ids.get(word)
+        if word_id is None:
+            word_id = len(self.words)
+            self.ids[word] = word_id
+            self.words.append(word)
+        return word_id
+
+    def intern_all(self, words):
+        """Return a list of the ids of given words, giving new words the next
+        ids in order of first appearance, the same as calling intern on each.
+        Faster than intern for long lists, because only new words are handled
+        in Python and the lookups run in C."""
+        ids = self.ids
+        # dict.fromkeys keeps the first appearance of each word, in order
+        for word in dict.fromkeys(words):
+            if word not in ids:
+                ids[word] = len(self.words)
+                self.words.append(word)
+        return list(map(ids.__getitem__, words))
+
+    def encode(self, words):
+        """Return a tuple of the ids of given words, or raise KeyError if any
+        word is not in this vocabulary."""
+        return tuple(self.ids[word] for word in words)
+
+    def decode(self, word_ids):
+        """Return a list of the words with given ids."""
+        return [self.words[word_id] for word_id in word_ids]